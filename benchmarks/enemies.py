@@ -0,0 +1,59 @@
+import os
+import tempfile
+import time
+import types
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from benchmarks.suite import generate_level
+from mario.world import World
+
+COUNTS = (10, 100, 1000, 10000)
+TICKS = 60
+WARMUP = 5
+ENEMY_DENSITY = 0.4
+
+
+def object_tick(world, camera):
+    world.creatures.refresh()
+    for sprite in world.creatures.sprites():
+        if not sprite.asleep:
+            sprite.update(blocks=world.blocks, camera=camera, creatures=world.creatures)
+
+
+def batched_tick(world, camera):
+    world.enemy_engine.step(camera)
+
+
+def measure(path, batch):
+    world = World(path, spawn_margin=10 ** 9, batch_enemies=batch)
+    world.load_level()
+    camera = types.SimpleNamespace(rect=pygame.Rect(0, 0, world.level_file.width, World.HEIGHT))
+    tick = batched_tick if batch else object_tick
+    for _ in range(WARMUP):
+        tick(world, camera)
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        tick(world, camera)
+    elapsed = (time.perf_counter() - start) / TICKS
+    return elapsed, len(world.creatures), sorted(tuple(sprite.rect) for sprite in world.creatures)
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((World.CAMERA_WIDTH, World.HEIGHT))
+    print(f"{'enemies':>8} {'objects ms/tick':>16} {'numpy ms/tick':>14} {'speedup':>8} {'match':>6}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in COUNTS:
+            path = generate_level(1, directory, count, int(count / ENEMY_DENSITY * 1.3) + 80,
+                                  enemy_density=ENEMY_DENSITY)
+            objects, enemies, object_rects = measure(path, False)
+            batched, _, batched_rects = measure(path, True)
+            print(f"{enemies:>8} {objects * 1000:16.3f} {batched * 1000:14.3f} {objects / batched:8.1f} "
+                  f"{str(object_rects == batched_rects):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import os
+import tempfile
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from benchmarks.suite import generate_level
+from mario import levelfile
+from mario.assets import assets
+from mario.world import World
+
+SCALES = (1, 10, 100)
+LENGTH = 220
+TILE_DENSITY = 0.2
+
+
+class TileSprite(pygame.sprite.Sprite):
+    def __init__(self, image, x, y):
+        pygame.sprite.Sprite.__init__(self)
+        self.images = []
+        self.die_image = None
+        self.animation_frame = 0
+        self.is_die = False
+        self.image = image
+        self.rect = image.get_rect(topleft=(x, y))
+
+
+def traced(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def measure(path):
+    world = World(path)
+    level = levelfile.load(path)
+    layer = world.build_static_tiles(level)
+    for name in layer.names:
+        assets.image(name)
+    layer, layer_bytes = traced(lambda: world.build_static_tiles(level))
+    sprites, sprite_bytes = traced(lambda: [TileSprite(image, x, y) for image, x, y in layer.tiles()])
+    level.close()
+    return len(layer), len(layer.loose), layer_bytes, sprite_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare static tile memory as sprites and as a tile layer")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((World.CAMERA_WIDTH, World.HEIGHT))
+    print(f"{'tiles':>8} {'loose':>6} {'sprites KiB':>12} {'layer KiB':>10} {'bytes/tile':>11} {'ratio':>6}")
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in SCALES:
+            path = generate_level(scale, directory, args.seed, LENGTH, tile_density=TILE_DENSITY)
+            tiles, loose, layer_bytes, sprite_bytes = measure(path)
+            print(f"{tiles:>8} {loose:>6} {sprite_bytes / 1024:12.1f} {layer_bytes / 1024:10.1f} "
+                  f"{layer_bytes / tiles:11.1f} {sprite_bytes / layer_bytes:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import os
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from benchmarks.suite import generate_level, summarize, timed
+from mario.world import World, Inputs
+
+SCALES = (1, 10, 100)
+LENGTH = 220
+TICKS = 120
+REPEAT = 20
+
+
+def measure(path, spawn_margin):
+    world = World(path, spawn_margin=spawn_margin)
+    world.begin()
+    for tick in range(TICKS):
+        world.step(Inputs(right=True, up=tick % 40 < 10))
+    state = world.save_state()
+    dump_ms = summarize(timed(world.save_state, REPEAT))["p50_ms"]
+    load_ms = summarize(timed(lambda: world.load_state(state), REPEAT))["p50_ms"]
+    return len(world.all_sprites), len(state), dump_ms, load_ms, world.save_state() == state
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((World.CAMERA_WIDTH, World.HEIGHT))
+    print(f"{'level':>6} {'streaming':>9} {'sprites':>8} {'bytes':>9} {'save ms':>8} {'load ms':>8} {'match':>6}")
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in SCALES:
+            path = generate_level(scale, directory, scale, LENGTH, enemy_density=0.2)
+            for streaming, spawn_margin in (("on", World.SPAWN_MARGIN), ("off", 10 ** 9)):
+                sprites, size, dump_ms, load_ms, match = measure(path, spawn_margin)
+                print(f"{'x' + str(scale):>6} {streaming:>9} {sprites:>8} {size:>9} {dump_ms:8.3f} {load_ms:8.3f} "
+                      f"{str(match):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from mario.groups import SpatialHashGroup
+from mario.sprites import Mushroom
+
+COUNTS = (12, 100, 250, 500, 1000, 2000, 4000)
+FRAMES = 30
+SPACING = 96
+
+
+def populate(group, count, rng):
+    for _ in range(count):
+        group.add(Mushroom(rng.randrange(0, count * SPACING), rng.randrange(100, 420), 0))
+
+
+def move(sprites, rng):
+    for sprite in sprites:
+        sprite.rect.x += rng.choice((-1, 1))
+
+
+def naive_frame(group, player):
+    sprites = group.sprites()
+    pygame.sprite.spritecollide(player, group, False)
+    for sprite in sprites:
+        pygame.sprite.spritecollide(sprite, group, False)
+
+
+def hash_frame(group, player):
+    group.refresh()
+    group.collide(player)
+    for sprite in group.sprites():
+        group.collide(sprite)
+
+
+def measure(frame, count, seed=1):
+    rng = random.Random(seed)
+    group = SpatialHashGroup()
+    populate(group, count, rng)
+    player = Mushroom(count * SPACING // 2, 380, 0)
+    elapsed = 0
+    for _ in range(FRAMES):
+        move(group.sprites(), rng)
+        start = time.perf_counter()
+        frame(group, player)
+        elapsed += time.perf_counter() - start
+    return elapsed / FRAMES
+
+
+def main():
+    print(f"{'creatures':>10} {'naive ms/frame':>15} {'hash ms/frame':>14} {'hash us/creature':>17}")
+    for count in COUNTS:
+        naive = measure(naive_frame, count) if count <= 1000 else None
+        hashed = measure(hash_frame, count)
+        naive_text = f"{naive * 1000:15.3f}" if naive is not None else f"{'-':>15}"
+        print(f"{count:>10} {naive_text} {hashed * 1000:14.3f} {hashed * 1e6 / count:17.2f}")
+
+
+if __name__ == "__main__":
+    main()
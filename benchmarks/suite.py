@@ -0,0 +1,183 @@
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from mario.assets import assets
+from mario.chunks import ChunkedLayer
+from mario.game import MarioGame
+from mario.hud import Hud
+from mario.levelgen import generate
+from mario.world import World, Inputs
+
+SCALES = (1, 10, 100, 1000)
+CREATURE_FACTOR = 4
+GENERATED_LENGTH = 220
+STAGES = ("load_map", "respawn", "tick", "collision", "offset_draw", "draw_interface")
+
+
+def make_level(scale, directory, source="mario/map.json"):
+    with open(source) as source_file:
+        game_map = json.load(source_file)
+    if scale == 1:
+        return source
+    length = game_map["level_end"] + 32 * 10
+    groups = game_map["groups"]
+    tiled = {name: [] for name in groups}
+    for copy in range(scale):
+        offset = copy * length
+        for name, entities in groups.items():
+            for entity in entities:
+                tiled[name].append(dict(entity, x=entity["x"] + offset))
+        for extra in range(1, CREATURE_FACTOR):
+            for creature in groups["creatures"]:
+                tiled["creatures"].append(dict(creature, x=creature["x"] + offset + 48 * extra))
+    game_map["groups"] = tiled
+    game_map["level_end"] = length * scale - 32 * 10
+    path = os.path.join(directory, f"map_x{scale}.json")
+    with open(path, "w") as level_file:
+        json.dump(game_map, level_file)
+    return path
+
+
+def generate_level(scale, directory, seed, length=GENERATED_LENGTH, **densities):
+    game_map = generate(length=length * scale, seed=seed, **densities)
+    path = os.path.join(directory, f"generated_{length * scale}_{seed}.json")
+    with open(path, "w") as level_file:
+        json.dump(game_map, level_file)
+    return path
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "ops_per_sec": len(samples) / sum(samples),
+        "p50_ms": statistics.median(samples) * 1000,
+        "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+        "samples": len(samples),
+    }
+
+
+def timed(function, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_level(path, scale, screen, font):
+    repeat = max(20, 300 // scale)
+    results = {}
+    results["load_map"] = summarize(timed(lambda: World(path).begin(), max(1, 20 // scale)))
+    world = World(path)
+    world.begin()
+    results["respawn"] = summarize(timed(world.reset, repeat))
+    world.take_events()
+
+    inputs = Inputs()
+    world.step(inputs)
+    results["tick"] = summarize(timed(lambda: world.step(inputs), repeat))
+
+    def collision():
+        player = world.player
+        world.blocks.collide(player)
+        world.creatures.collide(player)
+        for creature in world.creatures.sprites():
+            world.blocks.collide(creature)
+            world.creatures.collide(creature)
+
+    results["collision"] = summarize(timed(collision, max(10, repeat // 3)))
+
+    layer = ChunkedLayer(World.HEIGHT, MarioGame.SKY_COLOR)
+    layer.add_layer(world.static_tiles)
+
+    def draw():
+        view = world.view()
+        layer.draw(screen, view)
+        world.all_sprites.offset_draw(screen, view)
+
+    results["offset_draw"] = summarize(timed(draw, repeat))
+
+    hud = Hud(font, World.CAMERA_WIDTH)
+    score = iter(range(10 ** 9))
+    results["draw_interface"] = summarize(timed(
+        lambda: hud.draw(screen, score=next(score), time=int(world.time), world=world.name,
+                         coins=world.player.coins, lives=world.lives), 300))
+    results["entities"] = len(world.all_sprites) + len(world.blocks)
+    results["updated"] = world.updated
+    return results
+
+
+def run(scales, seed=None):
+    pygame.init()
+    screen = pygame.display.set_mode((World.CAMERA_WIDTH, World.HEIGHT))
+    font = pygame.font.Font("mario/BarcadeBrawlRegular.ttf", 20)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in scales:
+            if seed is None:
+                path = make_level(scale, directory)
+            else:
+                path = generate_level(scale, directory, seed)
+            results[f"x{scale}"] = bench_level(path, scale, screen, font)
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for level, stages in results.items():
+        for stage in STAGES:
+            if stage not in baseline.get(level, {}):
+                continue
+            before = baseline[level][stage]["p50_ms"]
+            after = stages[stage]["p50_ms"]
+            if after > before * (1 + threshold):
+                regressions.append(f"{level} {stage}: p50 {before:.3f} ms -> {after:.3f} ms")
+    return regressions
+
+
+def report(results):
+    print(f"{'level':>6} {'stage':>15} {'ops/sec':>12} {'p50 ms':>10} {'p99 ms':>10}")
+    for level, stages in results.items():
+        for stage in STAGES:
+            result = stages[stage]
+            print(f"{level:>6} {stage:>15} {result['ops_per_sec']:12.1f} {result['p50_ms']:10.3f} "
+                  f"{result['p99_ms']:10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark level load, tick, collision and draw")
+    parser.add_argument("--scales", default=",".join(map(str, SCALES)),
+                        help="comma separated level length multipliers")
+    parser.add_argument("--generated", type=int, metavar="SEED",
+                        help="benchmark levels from mario.levelgen with this seed instead of tiled map.json")
+    parser.add_argument("--output", default="benchmarks/results.json")
+    parser.add_argument("--baseline", default="benchmarks/baseline.json")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed p50 slowdown before flagging")
+    args = parser.parse_args()
+
+    results = run([int(scale) for scale in args.scales.split(",")], args.generated)
+    report(results)
+    print(assets.report())
+    with open(args.baseline if args.save_baseline else args.output, "w") as output_file:
+        json.dump(results, output_file, indent=2)
+    if args.save_baseline or not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline) as baseline_file:
+        regressions = compare(results, json.load(baseline_file), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,40 @@
+import os
+import statistics
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from mario.game import MarioGame
+from mario.text import text_layout
+
+REPEAT = 200
+NAMES = ("Кирилл", "Иван", "Никита", "Анастасия", "Player One", "Мария", "Long Player Name", "Ёж")
+
+
+def timed(render, before):
+    samples = []
+    for _ in range(REPEAT):
+        before()
+        start = time.perf_counter()
+        render()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    pygame.init()
+    game = MarioGame()
+    game.screen = pygame.display.set_mode((MarioGame.CAMERA_WIDTH, MarioGame.HEIGHT))
+    game.leaderboard.records = [{"name": name, "score": 5000 - 500 * index} for index, name in enumerate(NAMES)]
+    screens = (("help", game.render_help), ("records", game.render_records),
+               ("congratulations", game.render_congratulations))
+    modes = (("cold", text_layout.clear), ("layout cached", text_layout.surfaces.clear), ("surface cached", lambda: None))
+    print(f"{'screen':>16} " + " ".join(f"{name + ' ms':>18}" for name, before in modes))
+    for screen, render in screens:
+        print(f"{screen:>16} " + " ".join(f"{timed(render, before):18.4f}" for name, before in modes))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,18 @@
+import argparse
+
 from mario.game import MarioGame
 
 if __name__ == '__main__':
-    game = MarioGame()
+    parser = argparse.ArgumentParser(description="Super Mario Bros")
+    parser.add_argument("--record", help="record the inputs and frame hashes of each game to this file")
+    parser.add_argument("--replay", help="play back a recorded game and check its frame hashes")
+    parser.add_argument("--replay-speed", type=int, default=1, help="ticks simulated per real-time tick in replay")
+    parser.add_argument("--fps", type=int, default=MarioGame.FPS, help="render frames per second")
+    parser.add_argument("--batch-enemies", action="store_true", help="simulate enemies with the NumPy enemy engine")
+    parser.add_argument("--checkpoints", type=int, default=0, metavar="PX",
+                        help="save a checkpoint every PX pixels of progress and respawn there after dying")
+    args = parser.parse_args()
+    if args.record and args.checkpoints:
+        parser.error("--checkpoints cannot be combined with --record, replays always respawn at the level start")
+    game = MarioGame(args.fps, args.record, args.replay, args.replay_speed, args.batch_enemies, args.checkpoints)
     game.start()
@@ -0,0 +1,51 @@
+import time
+
+import pygame
+
+
+class AssetCache:
+    def __init__(self, path="mario/images"):
+        self.path = path
+        self.surfaces = {}
+        self.flipped_surfaces = {}
+        self.loads = 0
+        self.hits = 0
+        self.load_time = 0
+
+    def image(self, name):
+        surface = self.surfaces.get(name)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        start = time.perf_counter()
+        surface = pygame.image.load(f"{self.path}/{name}.png")
+        if pygame.display.get_surface() is not None:
+            if surface.get_flags() & pygame.SRCALPHA:
+                surface = surface.convert_alpha()
+            else:
+                surface = surface.convert()
+        self.load_time += time.perf_counter() - start
+        self.loads += 1
+        self.surfaces[name] = surface
+        return surface
+
+    def flipped(self, name):
+        surface = self.flipped_surfaces.get(name)
+        if surface is None:
+            surface = pygame.transform.flip(self.image(name), True, False)
+            self.flipped_surfaces[name] = surface
+        else:
+            self.hits += 1
+        return surface
+
+    def saved_time(self):
+        if not self.loads:
+            return 0
+        return self.hits * self.load_time / self.loads
+
+    def report(self):
+        return (f"images: {self.loads} loaded in {self.load_time * 1000:.1f} ms, "
+                f"{self.hits} loads saved (~{self.saved_time() * 1000:.1f} ms)")
+
+
+assets = AssetCache()
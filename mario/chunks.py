@@ -0,0 +1,56 @@
+import pygame
+
+
+class ChunkedLayer:
+    CHUNK_WIDTH = 512
+
+    def __init__(self, height, background, keep_behind=1, build_ahead=1):
+        self.height = height
+        self.background = background
+        self.keep_behind = keep_behind
+        self.build_ahead = build_ahead
+        self.items = {}
+        self.layers = []
+        self.chunks = {}
+
+    def clear(self):
+        self.items.clear()
+        self.layers.clear()
+        self.chunks.clear()
+
+    def add(self, image, x, y):
+        for index in range(x // self.CHUNK_WIDTH, (x + image.get_width() - 1) // self.CHUNK_WIDTH + 1):
+            self.items.setdefault(index, []).append((image, x, y))
+
+    def add_layer(self, layer):
+        self.layers.append(layer)
+
+    def chunk(self, index):
+        chunk = self.chunks.get(index)
+        if chunk is None:
+            chunk = pygame.Surface((self.CHUNK_WIDTH, self.height))
+            if pygame.display.get_surface() is not None:
+                chunk = chunk.convert()
+            chunk.fill(self.background)
+            left = index * self.CHUNK_WIDTH
+            for image, x, y in self.items.get(index, ()):
+                chunk.blit(image, (x - left, y))
+            for layer in self.layers:
+                for image, x, y in layer.tiles_in(left, left + self.CHUNK_WIDTH):
+                    chunk.blit(image, (x - left, y))
+            self.chunks[index] = chunk
+        return chunk
+
+    def draw(self, surface: pygame.Surface, camera: pygame.Rect):
+        left = -camera.left
+        first = left // self.CHUNK_WIDTH
+        last = (left + camera.width - 1) // self.CHUNK_WIDTH
+        for index in range(first, last + 1):
+            surface.blit(self.chunk(index), (index * self.CHUNK_WIDTH + camera.left, camera.top))
+        for index in range(last + 1, last + self.build_ahead + 1):
+            if index not in self.chunks:
+                self.chunk(index)
+                break
+        for index in list(self.chunks):
+            if index < first - self.keep_behind or index > last + self.build_ahead:
+                del self.chunks[index]
@@ -0,0 +1,323 @@
+import pygame
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CELL = 32
+EMPTY = -1
+IRREGULAR = -2
+REBUILD_CHANGES = 64
+DIE_FRAMES = 30
+DIE_POSE = -1
+RIGHT_POSE = 1000
+
+
+def pose_of(sprite):
+    if sprite.image is sprite.die_image:
+        return DIE_POSE
+    for pose, image in enumerate(sprite.right_move_images):
+        if sprite.image is image:
+            return pose + RIGHT_POSE
+    for pose, image in enumerate(sprite.left_move_images):
+        if sprite.image is image:
+            return pose
+    return 0
+
+
+class EnemyView(pygame.sprite.Sprite):
+    static = False
+    batched = True
+
+    def __init__(self, engine, index, sprite):
+        pygame.sprite.Sprite.__init__(self)
+        self.engine = engine
+        self.index = index
+        self.sprite_type = type(sprite)
+        self.rect = sprite.rect.copy()
+        self.left_move_images = sprite.left_move_images
+        self.right_move_images = sprite.right_move_images
+        self.die_image = sprite.die_image
+
+    @property
+    def image(self):
+        pose = int(self.engine.pose[self.index])
+        if pose == DIE_POSE:
+            return self.die_image
+        if pose >= RIGHT_POSE:
+            return self.right_move_images[pose - RIGHT_POSE]
+        return self.left_move_images[pose]
+
+    @property
+    def is_die(self):
+        return bool(self.engine.dead[self.index])
+
+    @is_die.setter
+    def is_die(self, value):
+        self.engine.dead[self.index] = value
+
+    @property
+    def animation_frame(self):
+        return int(self.engine.frame[self.index])
+
+    @animation_frame.setter
+    def animation_frame(self, value):
+        self.engine.frame[self.index] = value
+
+    @property
+    def asleep(self):
+        return bool(self.engine.asleep[self.index])
+
+    @asleep.setter
+    def asleep(self, value):
+        self.engine.asleep[self.index] = value
+
+    @property
+    def is_active(self):
+        return bool(self.engine.active[self.index])
+
+    @property
+    def speed_x(self):
+        return int(self.engine.vx[self.index])
+
+    @property
+    def speed_y(self):
+        return int(self.engine.vy[self.index])
+
+    def kill(self):
+        if self.engine is not None:
+            self.engine.release(self)
+        pygame.sprite.Sprite.kill(self)
+
+
+class EnemyEngine:
+    FIELDS = (("x", "int64"), ("y", "int64"), ("width", "int64"), ("height", "int64"), ("vx", "int64"),
+              ("vy", "int64"), ("frame", "int64"), ("frames", "int64"), ("pose", "int64"), ("alive", "bool"),
+              ("active", "bool"), ("dead", "bool"), ("asleep", "bool"))
+    BLOCK_FIELDS = ("block_left", "block_top", "block_right", "block_bottom")
+
+    def __init__(self, blocks, origin_y=0, capacity=64):
+        self.blocks = blocks
+        self.origin_y = origin_y
+        self.count = 0
+        self.released = 0
+        self.updated = 0
+        self.views = []
+        for name, dtype in self.FIELDS:
+            setattr(self, name, numpy.zeros(capacity, dtype))
+        for name in self.BLOCK_FIELDS:
+            setattr(self, name, numpy.zeros(capacity, "int64"))
+        self.block_orders = {}
+        self.blocks_version = -1
+        self.irregular = set()
+        self.grid = numpy.full((0, 0), EMPTY, "int32")
+        self.grid_top = 0
+        self.grid_left = 0
+
+    def clear(self):
+        for view in self.views:
+            if view is not None:
+                view.engine = None
+        self.views = []
+        self.count = 0
+        self.released = 0
+        self.alive[:] = False
+
+    def add(self, sprite):
+        if self.count == len(self.x):
+            for name, dtype in self.FIELDS:
+                setattr(self, name, grown(getattr(self, name), self.count * 2))
+        index = self.count
+        self.count += 1
+        view = EnemyView(self, index, sprite)
+        self.views.append(view)
+        self.x[index], self.y[index], self.width[index], self.height[index] = sprite.rect
+        self.vx[index] = sprite.speed_x
+        self.vy[index] = sprite.speed_y
+        self.frame[index] = sprite.animation_frame
+        self.frames[index] = len(sprite.left_move_images)
+        self.pose[index] = pose_of(sprite)
+        self.alive[index] = True
+        self.active[index] = sprite.is_active
+        self.dead[index] = sprite.is_die
+        self.asleep[index] = sprite.asleep
+        return view
+
+    def release(self, view):
+        self.alive[view.index] = False
+        self.asleep[view.index] = False
+        self.views[view.index] = None
+        view.engine = None
+        self.released += 1
+
+    def compact(self):
+        keep = numpy.flatnonzero(self.alive[:self.count])
+        for name, dtype in self.FIELDS:
+            array = getattr(self, name)
+            array[:len(keep)] = array[keep]
+            array[len(keep):] = 0
+        self.views = [self.views[index] for index in keep]
+        for index, view in enumerate(self.views):
+            view.index = index
+        self.count = len(keep)
+        self.released = 0
+
+    def cells_of(self, rect):
+        return (slice((rect.top - self.origin_y) // CELL - self.grid_top,
+                      (rect.bottom - 1 - self.origin_y) // CELL + 1 - self.grid_top),
+                slice(rect.left // CELL - self.grid_left, (rect.right - 1) // CELL + 1 - self.grid_left))
+
+    def fits(self, rect):
+        rows, columns = self.cells_of(rect)
+        return (rows.start >= 0 and rows.stop <= self.grid.shape[0] and
+                columns.start >= 0 and columns.stop <= self.grid.shape[1])
+
+    def sync_blocks(self):
+        if self.blocks.version == self.blocks_version:
+            return
+        self.blocks_version = self.blocks.version
+        orders = self.blocks.order
+        removed = [sprite for sprite in self.block_orders if sprite not in orders]
+        added = [sprite for sprite in orders if sprite not in self.block_orders]
+        for sprite in removed:
+            del self.block_orders[sprite]
+        for sprite in added:
+            order = orders[sprite]
+            self.block_orders[sprite] = order
+            if order >= len(self.block_left):
+                for name in self.BLOCK_FIELDS:
+                    setattr(self, name, grown(getattr(self, name), order * 2))
+            self.block_left[order], self.block_top[order] = sprite.rect.topleft
+            self.block_right[order], self.block_bottom[order] = sprite.rect.bottomright
+
+        if not self.block_orders:
+            return
+        if len(removed) + len(added) > REBUILD_CHANGES or not all(self.fits(sprite.rect) for sprite in added):
+            self.build_grid()
+            return
+        for sprite in removed:
+            self.erase(sprite)
+        for sprite in added:
+            self.paint(sprite, self.block_orders[sprite])
+
+    def build_grid(self):
+        rects = [sprite.rect for sprite in self.block_orders]
+        self.grid_top = min((rect.top - self.origin_y) // CELL for rect in rects)
+        self.grid_left = min(rect.left // CELL for rect in rects)
+        self.grid = numpy.full((max((rect.bottom - 1 - self.origin_y) // CELL + 1 for rect in rects) - self.grid_top,
+                                max((rect.right - 1) // CELL + 1 for rect in rects) - self.grid_left),
+                               EMPTY, "int32")
+        self.irregular = set()
+        for sprite, order in self.block_orders.items():
+            self.paint(sprite, order)
+
+    def paint(self, sprite, order):
+        rect = sprite.rect
+        cells = self.grid[self.cells_of(rect)]
+        if rect.left % CELL or rect.width % CELL or (rect.top - self.origin_y) % CELL or rect.height % CELL:
+            self.irregular.add(sprite)
+            cells[...] = IRREGULAR
+        else:
+            numpy.maximum(cells, order, out=cells, where=cells != IRREGULAR)
+
+    def erase(self, sprite):
+        self.irregular.discard(sprite)
+        rows, columns = self.cells_of(sprite.rect)
+        self.grid[rows, columns] = EMPTY
+        probe = pygame.sprite.Sprite()
+        probe.rect = pygame.Rect((columns.start + self.grid_left) * CELL,
+                                 (rows.start + self.grid_top) * CELL + self.origin_y,
+                                 (columns.stop - columns.start) * CELL, (rows.stop - rows.start) * CELL)
+        for neighbour in self.blocks.collide(probe):
+            clipped = probe.rect.clip(neighbour.rect)
+            cells = self.grid[self.cells_of(clipped)]
+            if neighbour in self.irregular:
+                cells[...] = IRREGULAR
+            else:
+                numpy.maximum(cells, self.block_orders[neighbour], out=cells, where=cells != IRREGULAR)
+
+    def block_hits(self, mask):
+        count = self.count
+        x, y = self.x[:count], self.y[:count]
+        first_column = x // CELL - self.grid_left
+        last_column = (x + self.width[:count] - 1) // CELL - self.grid_left
+        first_row = (y - self.origin_y) // CELL - self.grid_top
+        last_row = (y + self.height[:count] - 1 - self.origin_y) // CELL - self.grid_top
+        rows, columns = self.grid.shape
+        hits = numpy.full(count, EMPTY, "int64")
+        cells = numpy.empty(count, "int64")
+        for column_offset in range(int(self.width[:count].max()) // CELL + 2):
+            column = first_column + column_offset
+            in_columns = mask & (column <= last_column) & (column >= 0) & (column < columns)
+            for row_offset in range(int(self.height[:count].max()) // CELL + 2):
+                row = first_row + row_offset
+                inside = in_columns & (row <= last_row) & (row >= 0) & (row < rows)
+                cells.fill(EMPTY)
+                cells[inside] = self.grid[row[inside], column[inside]]
+                numpy.maximum(hits, cells, out=hits, where=hits != IRREGULAR)
+                hits[cells == IRREGULAR] = IRREGULAR
+        for index in numpy.flatnonzero(hits == IRREGULAR):
+            probe = pygame.sprite.Sprite()
+            probe.rect = pygame.Rect(int(x[index]), int(y[index]), int(self.width[index]), int(self.height[index]))
+            collided = self.blocks.collide(probe)
+            hits[index] = self.block_orders[collided[-1]] if collided else EMPTY
+        return hits
+
+    def step(self, camera):
+        if self.released > 32 and self.released * 2 > self.count:
+            self.compact()
+        self.updated = 0
+        if not self.count:
+            return
+        self.sync_blocks()
+        count = self.count
+        x, y, width, height = self.x[:count], self.y[:count], self.width[:count], self.height[:count]
+        vx, vy, frame, pose = self.vx[:count], self.vy[:count], self.frame[:count], self.pose[:count]
+        active, dead, asleep = self.active[:count], self.dead[:count], self.asleep[:count]
+        awake = self.alive[:count] & ~asleep
+        self.updated = int(numpy.count_nonzero(awake))
+        old_x, old_y = x.copy(), y.copy()
+
+        y[awake] += vy[awake]
+        hits = self.block_hits(awake)
+        down, up = (hits >= 0) & (vy > 0), (hits >= 0) & (vy < 0)
+        y[down] = self.block_top[hits[down]] - height[down]
+        y[up] = self.block_bottom[hits[up]]
+
+        x[awake] += vx[awake]
+        hits = self.block_hits(awake)
+        hit = hits >= 0
+        forward, back = hit & (vx > 0), hit & (vx < 0)
+        x[forward] = self.block_left[hits[forward]] - width[forward]
+        x[back] = self.block_right[hits[back]]
+        vx[hit] *= -1
+
+        view = camera.rect
+        activated = awake & ~active & (x < view.right) & (x + width > view.left) & (y < view.bottom) & \
+            (y + height > view.top)
+
+        frame[awake] += 1
+        dying = awake & dead
+        vx[dying] = 0
+        walk = frame // 8 % self.frames[:count]
+        pose[awake] = numpy.where(vx <= 0, walk, walk + RIGHT_POSE)[awake]
+        pose[dying] = DIE_POSE
+        expired = numpy.flatnonzero(dying & (frame > DIE_FRAMES))
+
+        vx[activated] = -1
+        active |= activated
+        asleep[awake] = (~active & (x == old_x) & (y == old_y))[awake]
+
+        views = self.views
+        moved = numpy.flatnonzero(awake & ((x != old_x) | (y != old_y)))
+        for index, new_x, new_y in zip(moved.tolist(), x[moved].tolist(), y[moved].tolist()):
+            views[index].rect.topleft = (new_x, new_y)
+        for index in expired:
+            views[index].kill()
+
+
+def grown(array, size):
+    bigger = numpy.zeros(max(size, len(array) * 2), array.dtype)
+    bigger[:len(array)] = array
+    return bigger
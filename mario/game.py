@@ -1,105 +1,95 @@
-import json
-
 import pygame
-from pygame.surface import Surface
 
-from mario.camera import Camera
-from mario.groups import OffsetGroup
-from mario.sprites import Player, Floor, Box, Brick, Pipe, Block, Mushroom, Turtle, Button
+from mario import savestate
+from mario.assets import assets
+from mario.chunks import ChunkedLayer
+from mario.hud import Hud
+from mario.leaderboard import Leaderboard
+from mario.replay import Recorder, Replay, world_hash
+from mario.sounds import sounds
+from mario.sprites import Button
+from mario.text import multiline_surface
+from mario.world import World, Inputs
 from pygame_textinput import TextInputVisualizer
 
 
 class MarioGame:
-    CAMERA_WIDTH = 1008
-    WIDTH = 10000
-    HEIGHT = 460
-    ZERO_POINT = HEIGHT - 32 * 3 / 2
+    CAMERA_WIDTH = World.CAMERA_WIDTH
+    HEIGHT = World.HEIGHT
+    ZERO_POINT = World.ZERO_POINT
     FPS = 60
+    MAX_FRAME_SKIP = 5
+    SKY_COLOR = (92, 148, 252)
+    MESSAGE_TIME = 3000
+    EXPOSE_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWSHOWN)
 
-    def __init__(self):
-        self.records = None
-        self.pause = None
+    def __init__(self, fps=FPS, record=None, replay=None, replay_speed=1, batch_enemies=False,
+                 checkpoint_spacing=0):
+        self.fps = fps
+        self.tick_time = 1000 / World.TICK_RATE
+        self.accumulator = 0
+        self.ticks = 0
+        self.record_path = record
+        self.recorder = None
+        self.replay = Replay(replay) if replay else None
+        self.replay_inputs = None
+        self.replay_hashes = None
+        self.replay_speed = replay_speed
+        self.replay_message = None
+        self.message = None
+        self.message_time = 0
+        self.leaderboard = Leaderboard()
+        self.records_version = None
         self.textinput = None
-        self.player = None
         self.running = True
-        self.time = 0
-        self.timer = 0
-        self.lives = 3
-        self.score = 0
-        self.coins = 3
         self.screen = None
         self.clock = pygame.time.Clock()
-        self.all_sprites = OffsetGroup()
-        self.blocks = pygame.sprite.Group()
-        self.creatures = pygame.sprite.Group()
-        self.font = None
-        self.camera = None
-        self.images = []
+        self.batch_enemies = batch_enemies
+        self.checkpoint_spacing = checkpoint_spacing
+        self.save_slot = 1
+        self.world = World(batch_enemies=batch_enemies, checkpoint_spacing=checkpoint_spacing)
+        self.restart = False
+        self.pause = False
         self.menu = []
         self.ok_button = None
-        self.images_surface = Surface((self.WIDTH, self.ZERO_POINT))
+        self.static_layer = ChunkedLayer(self.HEIGHT, self.SKY_COLOR)
         self.font = pygame.font.Font("mario/mario.otf", 35)
         self.game_font = pygame.font.Font("mario/BarcadeBrawlRegular.ttf", 20)
         self.menu_font = pygame.font.Font("mario/mario.otf", 50)
+        self.hud = Hud(self.game_font, self.CAMERA_WIDTH)
+        self.screen_surfaces = {}
+        self.drawn_screen = None
+        self.full_redraw = True
+        self.dirty_rects = []
+        self.textinput_rect = None
+        self.textinput_state = None
         self.current_screen = "menu"
-        self.level_end = 0
-        self.game_end = False
-        self.world = ""
 
     def start(self):
         pygame.init()
         pygame.mixer.init()
+        sounds.load()
         self.screen = pygame.display.set_mode((self.CAMERA_WIDTH, self.HEIGHT))
-        pygame.display.set_icon(pygame.image.load("mario/images/mario1.png"))
+        pygame.display.set_icon(assets.image("mario1"))
         pygame.display.set_caption("Super Mario Bros")
         self.ok_button = Button(self.CAMERA_WIDTH, self.HEIGHT - 64, "    ОК    ", self.font)
-        self.load_map()
+        self.leaderboard.start()
         self.create_menu()
         self.create_textinput()
+        if self.replay:
+            self.game_initialize()
         self.loop()
 
-    def load_map(self):
-        game_map = json.load(open("mario/map.json", "r"), object_hook=sprites_decoder)
-        self.level_end = game_map["level_end"]
-        self.records = json.load(open("mario/records.json", "r", encoding="utf8"))
-        self.time = game_map["time"]
-        self.world = game_map["world"]
-        self.create_images_surface(game_map)
-        self.all_sprites.empty()
-        self.player = Player(game_map["player"]["x"], self.ZERO_POINT, self.CAMERA_WIDTH, self.score, self.coins)
-        self.blocks.empty()
-        self.creatures.empty()
-        for floor in game_map["groups"]["floor"]:
-            x = floor["x"]
-            for floor_offset in range(floor["width"]):
-                floor_sprite = Floor(x + 32 * floor_offset, self.HEIGHT + 16)
-                self.all_sprites.add(floor_sprite)
-                self.blocks.add(floor_sprite)
-                floor_sprite = Floor(x + 32 * floor_offset, self.HEIGHT - 16)
-                self.all_sprites.add(floor_sprite)
-                self.blocks.add(floor_sprite)
-
-        for sprite in game_map["groups"]["blocks"]:
-            self.all_sprites.add(sprite)
-            self.blocks.add(sprite)
-        for sprite in game_map["groups"]["creatures"]:
-            self.all_sprites.add(sprite)
-            self.creatures.add(sprite)
-        self.all_sprites.add(self.player)
-
-        self.camera = Camera(self.player, 0, 0, self.CAMERA_WIDTH, self.HEIGHT, self.all_sprites)
-
-    def create_images_surface(self, game_map):
-        random_color = (100, 150, 200)
-        self.images_surface.fill(random_color)
-        self.images_surface.set_colorkey(random_color)
-        for image in game_map["groups"]["images"]:
+    def build_static_layer(self):
+        self.static_layer.clear()
+        for image in self.world.scenery:
             if "type" in image:
-                loaded_image = pygame.image.load(f"mario/images/{image['name'].lower()}{image['type']}.png")
+                loaded_image = assets.image(f"{image['name'].lower()}{image['type']}")
             else:
-                loaded_image = pygame.image.load(f"mario/images/{image['name'].lower()}.png")
-            self.images_surface.blit(loaded_image, (image["x"], self.images_surface.get_height() -
-                                                    loaded_image.get_height() - image["bottom"]))
+                loaded_image = assets.image(image['name'].lower())
+            self.static_layer.add(loaded_image, image["x"],
+                                  int(self.ZERO_POINT) - loaded_image.get_height() - image["bottom"])
+        self.static_layer.add_layer(self.world.static_tiles)
 
     def create_menu(self):
         top = 60
@@ -118,24 +108,41 @@ class MarioGame:
     def loop(self):
         self.running = True
         while self.running:
-            self.clock.tick(self.FPS)
+            elapsed = self.clock.tick(self.fps)
             events = pygame.event.get()
-            self.screen.fill((0, 0, 0))
             for event in events:
                 if event.type == pygame.QUIT:
                     self.running = False
+                if event.type in self.EXPOSE_EVENTS:
+                    self.drawn_screen = None
                 if event.type == pygame.KEYUP and self.current_screen == "game":
                     if event.key == pygame.K_r:
-                        self.load_map()
+                        self.restart = True
                     if event.key == pygame.K_p:
-                        self.pause = not self.pause
+                        self.pause = True
+                    if pygame.K_1 <= event.key <= pygame.K_4:
+                        self.save_slot = event.key - pygame.K_0
+                    if event.key == pygame.K_F5 and not self.replay_inputs:
+                        self.quick_save()
+                    if event.key == pygame.K_F9 and not self.replay_inputs:
+                        self.quick_load()
                     if event.key == pygame.K_ESCAPE:
                         self.current_screen = "menu"
-                        pygame.mixer.music.stop()
-                        pygame.mixer.stop()
+                        sounds.stop_music()
+                        sounds.stop()
+            if self.recorder and self.current_screen != "game":
+                self.stop_recording()
             if self.current_screen == "game":
-                self.game_screen()
-            elif self.current_screen == "menu":
+                self.drawn_screen = "game"
+                self.game_screen(elapsed)
+                pygame.display.flip()
+                continue
+            self.full_redraw = self.current_screen != self.drawn_screen
+            if self.full_redraw:
+                self.drawn_screen = self.current_screen
+                self.screen.fill((0, 0, 0))
+                self.dirty_rects.append(self.screen.get_rect())
+            if self.current_screen == "menu":
                 self.menu_screen(events)
             elif self.current_screen == "records":
                 self.records_screen(events)
@@ -143,90 +150,160 @@ class MarioGame:
                 self.help_screen(events)
             elif self.current_screen == "new_record":
                 self.new_record_screen(events)
-            pygame.display.flip()
+            pygame.display.update(self.dirty_rects)
+            self.dirty_rects.clear()
 
+        self.stop_recording()
+        self.leaderboard.close()
         pygame.quit()
 
-    def game_screen(self):
-        self.score = self.player.score
-        self.coins = self.player.coins
-        if not self.game_end and self.lives >= 0 and not self.pause:
-            self.camera.scroll()
-            self.all_sprites.update(blocks=self.blocks, creatures=self.creatures, camera=self.camera,
-                                    all_sprites=self.all_sprites)
-            self.time -= 2 / self.FPS
-        if self.game_end:
-            self.time -= 60 / self.FPS
-            self.player.score += int(60 / self.FPS * 50)
-            self.score = self.player.score
-            if self.time <= 0:
-                self.current_screen = "new_record"
-        if self.player.is_die:
-            self.lives -= 1
-            self.game_initialize()
-            if self.lives < 0:
-                pygame.mixer.music.stop()
-                pygame.mixer.music.load("mario/sounds/gameover.mp3")
-                pygame.mixer.music.play()
-        self.screen.fill((92, 148, 252))
-        self.screen.blit(self.images_surface, self.camera)
-        self.all_sprites.offset_draw(self.screen, self.camera)
+    def game_screen(self, elapsed):
+        self.message_time -= elapsed
+        max_ticks = self.MAX_FRAME_SKIP
+        if self.replay_inputs:
+            elapsed *= self.replay_speed
+            max_ticks *= self.replay_speed
+        self.accumulator += elapsed
+        ticks = 0
+        while self.accumulator >= self.tick_time and ticks < max_ticks and self.current_screen == "game":
+            inputs = self.next_inputs()
+            if inputs is None:
+                self.current_screen = "menu"
+                break
+            self.handle_world_events(self.world.step(inputs))
+            self.check_tick(inputs)
+            self.accumulator -= self.tick_time
+            ticks += 1
+        if ticks == max_ticks:
+            self.accumulator = min(self.accumulator, self.tick_time)
+        alpha = min(self.accumulator / self.tick_time, 1)
+        view = self.world.view(alpha)
+        self.static_layer.draw(self.screen, view)
+        self.world.all_sprites.offset_draw(self.screen, view, alpha)
         self.draw_interface()
-        if self.lives < 0:
-            self.timer += 1
+        if self.world.lives < 0:
             self.screen.fill((0, 0, 0))
             ren = self.game_font.render("GAME OVER", True, (255, 255, 255))
             self.screen.blit(ren, (self.CAMERA_WIDTH / 2 - ren.get_width() / 2, self.HEIGHT / 2 - ren.get_height() / 2))
-            if self.timer > 250:
-                self.timer = 0
-                pygame.mixer.music.stop()
-                self.current_screen = "new_record"
-        if self.pause:
+        if self.world.pause:
             ren = self.game_font.render("PAUSE", True, (255, 255, 255))
             self.screen.blit(ren, (self.CAMERA_WIDTH / 2 - ren.get_width() / 2, self.HEIGHT / 2 - ren.get_height() / 2))
-        if self.player.rect.y > self.HEIGHT and not self.player.die_animation:
-            self.player.die()
-        if self.player.rect.x >= self.level_end and not self.game_end:
-            self.game_end = True
-            self.player.kill()
-            pygame.mixer.music.stop()
-            pygame.mixer.music.load("mario/sounds/win.mp3")
-            pygame.mixer.music.play()
+        y = 60
+        for ren in (self.replay_message, self.message if self.message_time > 0 else None):
+            if ren:
+                self.screen.blit(ren, (self.CAMERA_WIDTH / 2 - ren.get_width() / 2, y))
+                y += ren.get_height()
+
+    def next_inputs(self):
+        if self.replay_inputs:
+            return next(self.replay_inputs, None)
+        inputs = Inputs.from_keys(pygame.key.get_pressed(), self.restart, self.pause)
+        self.restart = False
+        self.pause = False
+        return inputs
+
+    def check_tick(self, inputs):
+        if self.recorder:
+            self.recorder.record(inputs, self.world)
+        if self.replay_inputs and self.replay_message is None and self.ticks < len(self.replay_hashes):
+            if world_hash(self.world) != self.replay_hashes[self.ticks]:
+                self.replay_message = self.render_message(f"REPLAY DESYNC AT TICK {self.ticks}")
+        self.ticks += 1
+
+    def render_message(self, text):
+        text = text.upper()
+        while self.game_font.size(text)[0] > self.CAMERA_WIDTH - 40:
+            text = text[:-4] + "..."
+        return self.game_font.render(text, True, (255, 255, 255))
+
+    def show_message(self, text):
+        self.message = self.render_message(text)
+        self.message_time = self.MESSAGE_TIME
+
+    def quick_save(self):
+        try:
+            savestate.save(savestate.slot_path(self.save_slot), self.world)
+        except OSError as error:
+            self.show_message(f"Slot {self.save_slot} save failed: {error.strerror or error}")
+            return
+        self.show_message(f"Saved to slot {self.save_slot}")
+
+    def quick_load(self):
+        try:
+            savestate.load(savestate.slot_path(self.save_slot), self.world)
+        except FileNotFoundError:
+            self.show_message(f"Slot {self.save_slot} is empty")
+            return
+        except OSError as error:
+            self.show_message(f"Slot {self.save_slot} load failed: {error.strerror or error}")
+            return
+        except ValueError as error:
+            self.show_message(f"Slot {self.save_slot} load failed: {error}")
+            return
+        self.show_message(f"Loaded slot {self.save_slot}")
+        self.stop_recording()
+        self.accumulator = 0
+        self.handle_world_events(self.world.take_events() + ["start"])
+
+    def stop_recording(self):
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+
+    def handle_world_events(self, events):
+        for event in events:
+            if event in ("jump", "coin", "kill"):
+                sounds.play(event)
+            elif event == "die":
+                sounds.stop_music()
+                sounds.play("lose")
+            elif event == "level":
+                self.build_static_layer()
+            elif event == "start":
+                pygame.mixer.music.set_volume(0.4)
+                sounds.play_music("fon")
+            elif event == "win":
+                sounds.stop_music()
+                sounds.play_music("win")
+            elif event == "game_over":
+                sounds.stop_music()
+                sounds.play_music("gameover")
+            elif event == "game_over_end":
+                sounds.stop_music()
+                self.current_screen = "new_record"
+            elif event == "level_complete":
+                self.current_screen = "new_record"
 
     def draw_interface(self):
-        ren = multiline_surface(f"SCORE\n{self.player.score}", self.game_font, pygame.Rect(0, 0, 160, 320),
-                                (255, 255, 255), None, 1)
-        self.screen.blit(ren, (30, 5))
-        ren = multiline_surface(f"TIME\n{int(self.time)}", self.game_font, pygame.Rect(0, 0, 160, 320),
-                                (255, 255, 255), None, 1)
-        self.screen.blit(ren, (230, 5))
-        ren = multiline_surface(f"WORLD\n{self.world}", self.game_font, pygame.Rect(0, 0, self.CAMERA_WIDTH, 320),
-                                (255, 255, 255), None, 1)
-        self.screen.blit(ren, (0, 5))
-        ren = multiline_surface(f"COINS\n{self.player.coins}", self.game_font, pygame.Rect(0, 0, 160, 320),
-                                (255, 255, 255), None, 1)
-        self.screen.blit(ren, (630, 5))
-        ren = multiline_surface(f"LIVES\n{self.lives}", self.game_font, pygame.Rect(0, 0, 160, 320),
-                                (255, 255, 255), None, 1)
-        self.screen.blit(ren, (830, 5))
+        self.hud.draw(self.screen, score=self.world.player.score, time=int(self.world.time), world=self.world.name,
+                      coins=self.world.player.coins, lives=self.world.lives)
 
     def game_initialize(self):
         self.current_screen = "game"
-        self.load_map()
-        pygame.mixer.music.load("mario/sounds/fon.mp3")
-        pygame.mixer.music.set_volume(0.4)
-        pygame.mixer.music.play()
-        self.game_end = False
+        self.stop_recording()
+        if self.replay:
+            self.world = self.replay.world(self.batch_enemies)
+            self.replay_inputs = self.replay.inputs()
+            self.replay_hashes = self.replay.hashes
+            self.replay = None
+            self.replay_message = None
+        else:
+            self.world = World(batch_enemies=self.batch_enemies, checkpoint_spacing=self.checkpoint_spacing)
+            self.world.begin()
+            self.replay_inputs = None
+        if self.record_path:
+            self.recorder = Recorder(self.record_path, self.world.level)
+        self.handle_world_events(self.world.take_events())
+        self.accumulator = 0
+        self.ticks = 0
 
     def menu_screen(self, events):
         for event in events:
             if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
                 if self.menu[0].in_focus(pygame.mouse.get_pos()):
-                    self.lives = 3
-                    self.score = 0
-                    self.coins = 0
                     self.game_initialize()
                 elif self.menu[1].in_focus(pygame.mouse.get_pos()):
+                    self.leaderboard.refresh()
                     self.current_screen = "records"
                 elif self.menu[2].in_focus(pygame.mouse.get_pos()):
                     self.current_screen = "help"
@@ -234,109 +311,112 @@ class MarioGame:
                     self.running = False
 
         for button in self.menu:
-            button.draw(self.screen, pygame.mouse.get_pos())
+            self.draw_button(button)
 
-    def records_screen(self, events):
+    def draw_button(self, button):
+        rect = button.draw(self.screen, pygame.mouse.get_pos(), self.full_redraw)
+        if rect:
+            self.dirty_rects.append(rect)
+
+    def draw_static(self, name, render, position):
+        if self.full_redraw:
+            self.dirty_rects.append(self.screen.blit(self.screen_surface(name, render), position))
+
+    def screen_surface(self, name, render):
+        surface = self.screen_surfaces.get(name)
+        if surface is None:
+            surface = render()
+            self.screen_surfaces[name] = surface
+        return surface
+
+    def render_records(self):
+        records = self.leaderboard.records
         records_string = ""
-        for record_number in range(len(self.records)):
-            records_string += f"{record_number + 1}) {self.records[record_number]['name']}: {self.records[record_number]['score']}\n"
-        ren = multiline_surface(records_string, self.font,
-                                pygame.Rect(0, 0, self.CAMERA_WIDTH - 100, self.HEIGHT - 84), (255, 255, 255),
-                                (0, 0, 0), 1)
-        self.screen.blit(ren, (50, 20))
+        for record_number in range(len(records)):
+            records_string += f"{record_number + 1}) {records[record_number]['name']}: {records[record_number]['score']}\n"
+        return multiline_surface(records_string, self.font,
+                                 pygame.Rect(0, 0, self.CAMERA_WIDTH - 100, self.HEIGHT - 84), (255, 255, 255),
+                                 (0, 0, 0), 1)
+
+    def render_help(self):
+        help = "УПРАВЛЕНИЕ\n\nДВИЖЕНИЕ: СТРЕЛОЧКИ/WASD\nP: ПАУЗА\nF5/F9: СОХРАНИТЬ/ЗАГРУЗИТЬ\n1-4: ЯЧЕЙКА СОХРАНЕНИЯ\nESC: ВЫЙТИ В МЕНЮ"
+        return multiline_surface(help, self.font, pygame.Rect(0, 0, self.CAMERA_WIDTH, self.HEIGHT),
+                                 (255, 255, 255), (0, 0, 0), 1)
+
+    def render_congratulations(self):
+        congratulations = "Поздравляем\nУ вас наибольшее количество очков\nПожалуйста, введите ваше имя"
+        return multiline_surface(congratulations, self.font, pygame.Rect(0, 0, self.CAMERA_WIDTH, self.HEIGHT),
+                                 (255, 255, 255), (0, 0, 0), 1)
+
+    def render_leaderboard_status(self):
+        leaderboard = self.leaderboard
+        return self.render_message(leaderboard.error or leaderboard.warning or
+                                   ("" if leaderboard.loaded else "loading..."))
+
+    def render_leaderboard_error(self):
+        return multiline_surface("Таблица рекордов\nнедоступна", self.font,
+                                 pygame.Rect(0, 0, self.CAMERA_WIDTH, self.HEIGHT), (255, 255, 255), (0, 0, 0), 1)
+
+    def check_leaderboard(self):
+        if self.records_version != self.leaderboard.version:
+            self.records_version = self.leaderboard.version
+            self.screen_surfaces.pop("records", None)
+            self.screen_surfaces.pop("leaderboard_status", None)
+            self.full_redraw = True
+
+    def draw_leaderboard_status(self):
+        if self.full_redraw:
+            status = self.screen_surface("leaderboard_status", self.render_leaderboard_status)
+            self.dirty_rects.append(self.screen.fill((0, 0, 0), (0, 0, self.CAMERA_WIDTH, status.get_height())))
+            self.screen.blit(status, (self.CAMERA_WIDTH / 2 - status.get_width() / 2, 0))
+
+    def records_screen(self, events):
+        self.check_leaderboard()
+        self.draw_static("records", self.render_records, (50, 20))
+        self.draw_leaderboard_status()
         self.draw_ok_button(events)
 
     def help_screen(self, events):
-        help = "УПРАВЛЕНИЕ\n\nДВИЖЕНИЕ: СТРЕЛОЧКИ/WASD\nP: ПАУЗА\nESC: ВЫЙТИ В МЕНЮ"
-        ren = multiline_surface(help, self.font, pygame.Rect(0, 0, self.CAMERA_WIDTH, self.HEIGHT),
-                                (255, 255, 255), (0, 0, 0), 1)
-        self.screen.blit(ren, (0, 50))
+        self.draw_static("help", self.render_help, (0, 50))
         self.draw_ok_button(events)
 
     def draw_ok_button(self, events):
-        self.ok_button.draw(self.screen, pygame.mouse.get_pos())
+        self.draw_button(self.ok_button)
         for event in events:
             if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
                 if self.ok_button.in_focus(event.pos):
                     self.current_screen = "menu"
 
+    def draw_textinput(self):
+        state = (self.textinput.value, self.textinput.manager.cursor_pos, self.textinput.cursor_visible)
+        if not self.full_redraw and state == self.textinput_state:
+            return
+        self.textinput_state = state
+        if self.textinput_rect and not self.full_redraw:
+            self.screen.fill((0, 0, 0), self.textinput_rect)
+            self.dirty_rects.append(self.textinput_rect)
+        self.textinput_rect = self.screen.blit(self.textinput.surface, (
+            self.CAMERA_WIDTH / 2 - self.textinput.text_width / 2, 220))
+        self.dirty_rects.append(self.textinput_rect)
+
     def new_record_screen(self, events):
-        if not self.records or self.records[0]["score"] < self.player.score:
+        self.check_leaderboard()
+        if not self.leaderboard.loaded:
+            if self.leaderboard.error:
+                self.draw_static("leaderboard_error", self.render_leaderboard_error, (0, 120))
+                self.draw_leaderboard_status()
+                self.draw_ok_button(events)
+            return
+        if self.leaderboard.is_best(self.world.player.score):
             self.textinput.update(events)
-            congratulations = "Поздравляем\nУ вас наибольшее количество очков\nПожалуйста, введите ваше имя"
-            ren = multiline_surface(congratulations, self.font, pygame.Rect(0, 0, self.CAMERA_WIDTH, self.HEIGHT),
-                                    (255, 255, 255), (0, 0, 0), 1)
-            self.screen.blit(ren, (0, 40))
-            self.screen.blit(self.textinput.surface,
-                             (
-                             self.CAMERA_WIDTH / 2 - self.textinput.font_object.size(self.textinput.value)[0] / 2, 220))
-            self.ok_button.draw(self.screen, pygame.mouse.get_pos())
+            self.draw_static("congratulations", self.render_congratulations, (0, 40))
+            self.draw_textinput()
+            self.draw_button(self.ok_button)
             for event in events:
                 if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
                     if self.ok_button.in_focus(event.pos):
-                        self.records.insert(0, {"name": self.textinput.value, "score": self.player.score})
-                        json.dump(self.records, open("mario/records.json", "w", encoding="utf8"), indent=2,
-                                  ensure_ascii=False)
+                        self.leaderboard.add(self.textinput.value, self.world.player.score)
                         self.textinput.value = ""
                         self.current_screen = "menu"
         else:
             self.current_screen = "menu"
-
-
-def sprites_decoder(dct):
-    if "thing" in dct:
-        if dct["thing"] == "Box":
-            return Box(dct["x"], MarioGame.ZERO_POINT - dct["bottom"])
-        elif dct["thing"] == "Brick":
-            return Brick(dct["x"], MarioGame.ZERO_POINT - dct["bottom"])
-        elif dct["thing"] == "Pipe":
-            return Pipe(dct["x"], MarioGame.ZERO_POINT - dct["bottom"], dct["type"])
-        elif dct["thing"] == "Block":
-            return Block(dct["x"], MarioGame.ZERO_POINT - dct["bottom"])
-        elif dct["thing"] == "Mushroom":
-            return Mushroom(dct["x"], MarioGame.ZERO_POINT - dct["bottom"], 0)
-        elif dct["thing"] == "Turtle":
-            return Turtle(dct["x"], MarioGame.ZERO_POINT - dct["bottom"], 0)
-    return dct
-
-
-def multiline_surface(text: str, font: pygame.font.Font, rect: pygame.rect.Rect, font_color: tuple, bg_color: tuple,
-                      justification=0):
-    final_lines = []
-    requested_lines = text.splitlines()
-    for requested_line in requested_lines:
-        if font.size(requested_line)[0] > rect.width:
-            words = requested_line.split(' ')
-            for word in words:
-                if font.size(word)[0] >= rect.width:
-                    raise Exception("The word " + word + " is too long to fit in the rect passed.")
-            accumulated_line = ""
-            for word in words:
-                test_line = accumulated_line + word + " "
-                if font.size(test_line)[0] < rect.width:
-                    accumulated_line = test_line
-                else:
-                    final_lines.append(accumulated_line)
-                    accumulated_line = word + " "
-            final_lines.append(accumulated_line)
-        else:
-            final_lines.append(requested_line)
-    surface = pygame.Surface(rect.size, pygame.SRCALPHA, 32)
-    surface = surface.convert_alpha()
-    if bg_color is not None:
-        surface.fill(bg_color)
-    accumulated_height = 0
-    for line in final_lines:
-        if accumulated_height + font.size(line)[1] >= rect.height:
-            raise Exception("Once word-wrapped, the text string was too tall to fit in the rect.")
-        temp_surface = font.render(line, True, font_color)
-        if justification == 0:
-            surface.blit(temp_surface, (0, accumulated_height))
-        elif justification == 1:
-            surface.blit(temp_surface, ((rect.width - temp_surface.get_width()) / 2, accumulated_height))
-        elif justification == 2:
-            surface.blit(temp_surface, (rect.width - temp_surface.get_width(), accumulated_height))
-        else:
-            raise Exception("Invalid justification argument: " + str(justification))
-        accumulated_height += font.size(line)[1]
-    return surface
@@ -1,13 +1,185 @@
 import pygame
 
-from mario.camera import Camera
-
 
 class OffsetGroup(pygame.sprite.Group):
+    BUCKET_WIDTH = 128
+    INTERPOLATION_LIMIT = 64
+
     def __init__(self):
         pygame.sprite.Group.__init__(self)
+        self.buckets = {}
+        self.sprite_buckets = {}
+        self.movers = set()
+        self.order = {}
+        self.counter = 0
+        self.max_width = 0
+        self.previous = {}
+        self.drawn = 0
+        self.culled = 0
+        self.updated = 0
+
+    def bucket_of(self, rect):
+        return rect.left // self.BUCKET_WIDTH
+
+    def add_internal(self, sprite, layer=None):
+        pygame.sprite.Group.add_internal(self, sprite, layer)
+        self.counter += 1
+        self.order[sprite] = self.counter
+        self.max_width = max(self.max_width, sprite.rect.width)
+        bucket = self.bucket_of(sprite.rect)
+        self.sprite_buckets[sprite] = bucket
+        self.buckets.setdefault(bucket, []).append(sprite)
+        if not sprite.static:
+            self.movers.add(sprite)
 
-    def offset_draw(self, surface: pygame.Surface, camera: Camera):
+    def remove_internal(self, sprite):
+        pygame.sprite.Group.remove_internal(self, sprite)
+        self.remove_from_bucket(sprite, self.sprite_buckets.pop(sprite))
+        self.movers.discard(sprite)
+        del self.order[sprite]
+
+    def remove_from_bucket(self, sprite, bucket):
+        sprites = self.buckets[bucket]
+        sprites.remove(sprite)
+        if not sprites:
+            del self.buckets[bucket]
+
+    def refresh(self):
+        for sprite in self.movers:
+            bucket = self.bucket_of(sprite.rect)
+            if bucket != self.sprite_buckets[sprite]:
+                self.remove_from_bucket(sprite, self.sprite_buckets[sprite])
+                self.sprite_buckets[sprite] = bucket
+                self.buckets.setdefault(bucket, []).append(sprite)
+
+    def update(self, **kwargs):
+        self.updated = 0
         for sprite in self.sprites():
-            rect = sprite.rect
-            surface.blit(sprite.image, pygame.Rect(rect.left + camera.left, rect.top, rect.width, rect.height))
+            if sprite.static or sprite.batched or sprite.asleep:
+                continue
+            sprite.update(**kwargs)
+            self.updated += 1
+
+    def remember(self):
+        self.previous = {sprite: sprite.rect.topleft for sprite in self.movers}
+
+    def visible_sprites(self, view: pygame.Rect):
+        self.refresh()
+        sprites = []
+        for bucket in range((view.left - self.max_width) // self.BUCKET_WIDTH, view.right // self.BUCKET_WIDTH + 1):
+            for sprite in self.buckets.get(bucket, ()):
+                if view.colliderect(sprite.rect):
+                    sprites.append(sprite)
+        sprites.sort(key=self.order.__getitem__)
+        return sprites
+
+    def offset_draw(self, surface: pygame.Surface, camera: pygame.Rect, alpha=1):
+        sprites = self.visible_sprites(pygame.Rect(-camera.left, -camera.top, camera.width, camera.height))
+        offset = camera.left
+        for sprite in sprites:
+            x, y = sprite.rect.topleft
+            previous = self.previous.get(sprite) if alpha < 1 else None
+            if previous and abs(x - previous[0]) + abs(y - previous[1]) < self.INTERPOLATION_LIMIT:
+                x = round(previous[0] + (x - previous[0]) * alpha)
+                y = round(previous[1] + (y - previous[1]) * alpha)
+            surface.blit(sprite.image, (x + offset, y))
+        self.drawn = len(sprites)
+        self.culled = len(self.spritedict) - self.drawn
+
+
+class TileGroup(pygame.sprite.Group):
+    CELL_SIZE = 32
+
+    def __init__(self):
+        pygame.sprite.Group.__init__(self)
+        self.cells = {}
+        self.tile_rects = {}
+        self.order = {}
+        self.counter = 0
+        self.version = 0
+
+    def cells_of(self, rect):
+        for column in range(rect.left // self.CELL_SIZE, (rect.right - 1) // self.CELL_SIZE + 1):
+            for row in range(rect.top // self.CELL_SIZE, (rect.bottom - 1) // self.CELL_SIZE + 1):
+                yield column, row
+
+    def add_internal(self, sprite, layer=None):
+        pygame.sprite.Group.add_internal(self, sprite, layer)
+        self.counter += 1
+        self.version += 1
+        self.order[sprite] = self.counter
+        self.tile_rects[sprite] = sprite.rect.copy()
+        for cell in self.cells_of(sprite.rect):
+            self.cells.setdefault(cell, []).append(sprite)
+
+    def remove_internal(self, sprite):
+        pygame.sprite.Group.remove_internal(self, sprite)
+        for cell in self.cells_of(self.tile_rects.pop(sprite)):
+            tiles = self.cells[cell]
+            tiles.remove(sprite)
+            if not tiles:
+                del self.cells[cell]
+        del self.order[sprite]
+        self.version += 1
+
+    def collide(self, sprite):
+        rect = sprite.rect
+        collided_sprites = []
+        for cell in self.cells_of(rect):
+            for tile in self.cells.get(cell, ()):
+                if tile not in collided_sprites and rect.colliderect(tile.rect):
+                    collided_sprites.append(tile)
+        collided_sprites.sort(key=self.order.__getitem__)
+        return collided_sprites
+
+
+class SpatialHashGroup(pygame.sprite.Group):
+    CELL_SIZE = 64
+
+    def __init__(self):
+        pygame.sprite.Group.__init__(self)
+        self.cells = {}
+        self.sprite_cells = {}
+        self.order = {}
+        self.counter = 0
+
+    def cell_of(self, rect):
+        return rect.centerx // self.CELL_SIZE, rect.centery // self.CELL_SIZE
+
+    def add_internal(self, sprite, layer=None):
+        pygame.sprite.Group.add_internal(self, sprite, layer)
+        self.counter += 1
+        self.order[sprite] = self.counter
+        cell = self.cell_of(sprite.rect)
+        self.sprite_cells[sprite] = cell
+        self.cells.setdefault(cell, []).append(sprite)
+
+    def remove_internal(self, sprite):
+        pygame.sprite.Group.remove_internal(self, sprite)
+        self.remove_from_cell(sprite, self.sprite_cells.pop(sprite))
+        del self.order[sprite]
+
+    def remove_from_cell(self, sprite, cell):
+        sprites = self.cells[cell]
+        sprites.remove(sprite)
+        if not sprites:
+            del self.cells[cell]
+
+    def refresh(self):
+        for sprite, cell in self.sprite_cells.items():
+            new_cell = self.cell_of(sprite.rect)
+            if new_cell != cell:
+                self.remove_from_cell(sprite, cell)
+                self.sprite_cells[sprite] = new_cell
+                self.cells.setdefault(new_cell, []).append(sprite)
+
+    def collide(self, sprite):
+        rect = sprite.rect
+        collided_sprites = []
+        for column in range(rect.left // self.CELL_SIZE - 1, rect.right // self.CELL_SIZE + 2):
+            for row in range(rect.top // self.CELL_SIZE - 1, rect.bottom // self.CELL_SIZE + 2):
+                for other in self.cells.get((column, row), ()):
+                    if other is not sprite and rect.colliderect(other.rect):
+                        collided_sprites.append(other)
+        collided_sprites.sort(key=self.order.__getitem__)
+        return collided_sprites
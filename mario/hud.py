@@ -0,0 +1,65 @@
+import pygame
+
+
+class GlyphStrip:
+    def __init__(self, font, color, characters="0123456789-"):
+        self.font = font
+        self.color = color
+        self.strip = font.render(characters, True, color)
+        self.height = self.strip.get_height()
+        self.areas = {}
+        for index, character in enumerate(characters):
+            left = font.size(characters[:index])[0]
+            self.areas[character] = pygame.Rect(left, 0, font.size(characters[:index + 1])[0] - left, self.height)
+
+    def render(self, text):
+        if any(character not in self.areas for character in text):
+            return self.font.render(text, True, self.color)
+        surface = pygame.Surface((sum(self.areas[character].width for character in text), self.height),
+                                 pygame.SRCALPHA, 32)
+        x = 0
+        for character in text:
+            area = self.areas[character]
+            surface.blit(self.strip, (x, 0), area)
+            x += area.width
+        return surface
+
+
+class HudPanel:
+    def __init__(self, label, x, width, font, glyphs):
+        self.x = x
+        self.width = width
+        self.glyphs = glyphs
+        self.label = font.render(label, True, glyphs.color)
+        self.value = None
+        self.surface = None
+
+    def draw(self, screen, value, y):
+        if value != self.value or self.surface is None:
+            self.value = value
+            self.surface = self.render(str(value))
+        screen.blit(self.surface, (self.x, y))
+
+    def render(self, text):
+        value = self.glyphs.render(text)
+        surface = pygame.Surface((self.width, self.label.get_height() + value.get_height()), pygame.SRCALPHA, 32)
+        surface.blit(self.label, ((self.width - self.label.get_width()) // 2, 0))
+        surface.blit(value, ((self.width - value.get_width()) // 2, self.label.get_height()))
+        return surface
+
+
+class Hud:
+    def __init__(self, font, screen_width, color=(255, 255, 255), y=5):
+        self.y = y
+        self.glyphs = GlyphStrip(font, color)
+        self.panels = {
+            "score": HudPanel("SCORE", 30, 160, font, self.glyphs),
+            "time": HudPanel("TIME", 230, 160, font, self.glyphs),
+            "world": HudPanel("WORLD", 0, screen_width, font, self.glyphs),
+            "coins": HudPanel("COINS", 630, 160, font, self.glyphs),
+            "lives": HudPanel("LIVES", 830, 160, font, self.glyphs),
+        }
+
+    def draw(self, screen, **values):
+        for name, value in values.items():
+            self.panels[name].draw(screen, value, self.y)
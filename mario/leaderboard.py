@@ -0,0 +1,124 @@
+import bisect
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_score ON records (score DESC, id);
+"""
+
+
+def valid_record(record):
+    return (isinstance(record, dict) and isinstance(record.get("name"), str)
+            and isinstance(record.get("score"), int) and not isinstance(record["score"], bool))
+
+
+class Leaderboard:
+    LIMIT = 8
+
+    def __init__(self, path="mario/records.db", legacy="mario/records.json", limit=LIMIT):
+        self.path = path
+        self.legacy = legacy
+        self.limit = limit
+        self.records = []
+        self.loaded = False
+        self.error = None
+        self.warning = None
+        self.version = 0
+        self.queue = queue.Queue()
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="leaderboard", daemon=True)
+            self.thread.start()
+            self.refresh()
+
+    def connect(self):
+        connection = sqlite3.connect(self.path, timeout=5)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            if connection.execute("SELECT COUNT(*) FROM records").fetchone()[0] == 0 and os.path.exists(self.legacy):
+                connection.executemany("INSERT INTO records (name, score, created) VALUES (?, ?, ?)",
+                                       [(name, score, time.time()) for name, score in self.legacy_records()])
+        return connection
+
+    def legacy_records(self):
+        try:
+            with open(self.legacy, encoding="utf8") as legacy_file:
+                records = json.load(legacy_file)
+        except (OSError, ValueError) as error:
+            self.warning = f"cannot import {self.legacy}: {error}"
+            return []
+        if not isinstance(records, list):
+            self.warning = f"{self.legacy} is not a list of records"
+            return []
+        valid = [(record["name"], record["score"]) for record in records if valid_record(record)]
+        if len(valid) < len(records):
+            self.warning = f"skipped {len(records) - len(valid)} malformed records in {self.legacy}"
+        return valid
+
+    def run(self):
+        connection = None
+        while True:
+            command = self.queue.get()
+            try:
+                if command is None:
+                    return
+                if connection is None:
+                    connection = self.connect()
+                if command[0] == "add":
+                    with connection:
+                        connection.execute("INSERT INTO records (name, score, created) VALUES (?, ?, ?)",
+                                           command[1:])
+                elif command[0] == "refresh":
+                    self.records = self.query(connection)
+                    self.loaded = True
+                self.error = None
+                self.version += 1
+            except Exception as error:
+                self.error = f"{command[0]} failed: {error}"
+                self.version += 1
+            finally:
+                self.queue.task_done()
+                if command is None and connection is not None:
+                    connection.close()
+
+    def query(self, connection):
+        rows = connection.execute("SELECT name, score FROM records ORDER BY score DESC, id LIMIT ?", (self.limit,))
+        return [{"name": name, "score": score} for name, score in rows]
+
+    def refresh(self):
+        self.queue.put(("refresh",))
+
+    def add(self, name, score):
+        records = list(self.records)
+        index = bisect.bisect_right([-record["score"] for record in records], -score)
+        records.insert(index, {"name": name, "score": score})
+        self.records = records[:self.limit]
+        self.version += 1
+        self.queue.put(("add", name, score, time.time()))
+        self.refresh()
+
+    def is_best(self, score):
+        if not self.loaded:
+            return False
+        return not self.records or self.records[0]["score"] < score
+
+    def close(self):
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
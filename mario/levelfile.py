@@ -0,0 +1,199 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+from mario.assets import assets
+
+MAGIC = b"MLVL"
+VERSION = 2
+HEADER = struct.Struct("<4sB20siiiiBIIIII")
+ENTITY = struct.Struct("<BBHii")
+SPAN = struct.Struct("<iiII")
+SCENERY = struct.Struct("<BBii")
+STRING = struct.Struct("<B")
+
+KINDS = ("Floor", "Box", "Brick", "Pipe", "Block", "Mushroom", "Turtle")
+FLOOR = 0
+TILE = 32
+IMAGES = {"Floor": "floor", "Box": "box4", "Brick": "brick", "Block": "block", "Pipe": "pipe{}"}
+SOLIDS = ("Floor", "Brick", "Block", "Pipe")
+
+
+def source_digest(data):
+    return hashlib.sha1(data).digest()
+
+
+def compiled_path(source):
+    return os.path.splitext(source)[0] + ".lvl"
+
+
+def tile_size(thing, variant):
+    return assets.image(IMAGES[thing].format(variant)).get_size()
+
+
+def merge_spans(rects):
+    cells = set()
+    spans = []
+    for x, bottom, width, height in rects:
+        if x % TILE or bottom % TILE or width % TILE or height % TILE:
+            spans.append((x, bottom, width, height))
+            continue
+        for column in range(x // TILE, (x + width) // TILE):
+            for row in range(bottom // TILE, (bottom + height) // TILE):
+                cells.add((column, row))
+
+    for column, row in sorted(cells, key=lambda cell: (cell[1], cell[0])):
+        if (column, row) not in cells:
+            continue
+        last = column
+        while (last + 1, row) in cells:
+            last += 1
+        top = row
+        while all((other, top + 1) in cells for other in range(column, last + 1)):
+            top += 1
+        for other in range(column, last + 1):
+            for other_row in range(row, top + 1):
+                cells.remove((other, other_row))
+        spans.append((column * TILE, row * TILE, (last - column + 1) * TILE, (top - row + 1) * TILE))
+    return spans
+
+
+def compile_level(data):
+    game_map = json.loads(data)
+    groups = game_map["groups"]
+    names = [game_map["world"]]
+    for image in groups["images"]:
+        if image["name"] not in names:
+            names.append(image["name"])
+
+    solids = []
+    for floor in groups["floor"]:
+        solids.append((floor["x"], -2 * TILE, floor["width"] * TILE, 2 * TILE))
+    level_width = max([x + width for x, bottom, width, height in solids] + [0])
+    for block in groups["blocks"]:
+        width, height = tile_size(block["thing"], block.get("type", 0))
+        level_width = max(level_width, block["x"] + width)
+        if block["thing"] in SOLIDS:
+            solids.append((block["x"], block["bottom"], width, height))
+    spans = merge_spans(solids)
+
+    output = [HEADER.pack(MAGIC, VERSION, source_digest(data), game_map["time"], game_map["level_end"], level_width,
+                          game_map["player"]["x"], game_map["lives"], len(groups["floor"]), len(groups["blocks"]),
+                          len(groups["creatures"]), len(spans), len(groups["images"]))]
+    for name in names:
+        encoded = name.encode("utf8")
+        output.append(STRING.pack(len(encoded)) + encoded)
+    output.append(STRING.pack(0))
+    for floor in groups["floor"]:
+        output.append(ENTITY.pack(FLOOR, 0, floor["width"], floor["x"], 0))
+    for entity in groups["blocks"] + groups["creatures"]:
+        output.append(ENTITY.pack(KINDS.index(entity["thing"]), entity.get("type", 0), 1, entity["x"],
+                                  entity["bottom"]))
+    for span in spans:
+        output.append(SPAN.pack(*span))
+    for image in groups["images"]:
+        output.append(SCENERY.pack(names.index(image["name"]), image.get("type", 0), image["x"], image["bottom"]))
+    return b"".join(output)
+
+
+class LevelFile:
+    def __init__(self, buffer):
+        self.buffer = buffer
+        (magic, version, self.digest, self.time, self.level_end, self.width, self.player_x, self.lives,
+         self.floor_count, self.block_count, self.creature_count, self.span_count,
+         self.scenery_count) = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} level file")
+        self.names = []
+        offset = HEADER.size
+        while True:
+            length, = STRING.unpack_from(buffer, offset)
+            offset += STRING.size
+            if not length:
+                break
+            self.names.append(bytes(buffer[offset:offset + length]).decode("utf8"))
+            offset += length
+        self.world = self.names[0]
+        self.entities_offset = offset
+        self.spans_offset = offset + ENTITY.size * (self.floor_count + self.block_count + self.creature_count)
+        self.scenery_offset = self.spans_offset + SPAN.size * self.span_count
+
+    @staticmethod
+    def open(path):
+        with open(path, "rb") as level_file:
+            return LevelFile(mmap.mmap(level_file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def records(self, first, count):
+        for index in range(first, first + count):
+            yield ENTITY.unpack_from(self.buffer, self.entities_offset + index * ENTITY.size)
+
+    def floors(self):
+        for kind, variant, width, x, bottom in self.records(0, self.floor_count):
+            yield x, width
+
+    def blocks(self):
+        for kind, variant, width, x, bottom in self.records(self.floor_count, self.block_count):
+            yield KINDS[kind], variant, x, bottom
+
+    def creatures(self):
+        for kind, variant, width, x, bottom in self.records(self.floor_count + self.block_count, self.creature_count):
+            yield KINDS[kind], variant, x, bottom
+
+    def spans(self):
+        for index in range(self.span_count):
+            yield SPAN.unpack_from(self.buffer, self.spans_offset + index * SPAN.size)
+
+    def scenery(self):
+        for index in range(self.scenery_count):
+            name, variant, x, bottom = SCENERY.unpack_from(self.buffer, self.scenery_offset + index * SCENERY.size)
+            image = {"name": self.names[name], "x": x, "bottom": bottom}
+            if variant:
+                image["type"] = variant
+            yield image
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+
+def load(source):
+    if source.endswith(".lvl"):
+        return LevelFile.open(source)
+    with open(source, "rb") as source_file:
+        data = source_file.read()
+    path = compiled_path(source)
+    if os.path.exists(path):
+        try:
+            level = LevelFile.open(path)
+        except (ValueError, struct.error):
+            level = None
+        if level and level.digest == source_digest(data):
+            return level
+        if level:
+            level.close()
+    compiled = compile_level(data)
+    try:
+        with open(path + ".tmp", "wb") as level_file:
+            level_file.write(compiled)
+        os.replace(path + ".tmp", path)
+    except OSError:
+        return LevelFile(compiled)
+    return LevelFile.open(path)
+
+
+def main(source, output=None):
+    with open(source, "rb") as source_file:
+        compiled = compile_level(source_file.read())
+    with open(output or compiled_path(source), "wb") as level_file:
+        level_file.write(compiled)
+    level = LevelFile(compiled)
+    print(f"{source}: {len(compiled)} bytes, {level.block_count} blocks and {level.floor_count} floor runs "
+          f"merged into {level.span_count} collision spans")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:3]))
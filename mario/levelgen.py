@@ -0,0 +1,96 @@
+import argparse
+import json
+import random
+
+TILE = 32
+START_COLUMNS = 16
+END_COLUMNS = 24
+
+
+def generate(length=200, tile_density=0.08, enemy_density=0.05, seed=0, time=400, world="R-1"):
+    rng = random.Random(seed)
+    length = max(length, START_COLUMNS + END_COLUMNS + 8)
+    floors = []
+    blocks = []
+    creatures = []
+    images = []
+    ground = set()
+
+    column = 0
+    while column < length:
+        width = START_COLUMNS if column == 0 else rng.randint(8, 40)
+        if column + width > length - END_COLUMNS:
+            width = length - column
+        floors.append({"x": column * TILE, "width": width})
+        column += width
+        if column < length - END_COLUMNS:
+            column += rng.randint(2, 3)
+
+    for floor in floors:
+        first = floor["x"] // TILE
+        last = first + floor["width"]
+        column = max(first, START_COLUMNS) + 1
+        while column < min(last, length - END_COLUMNS) - 1:
+            if rng.random() >= tile_density:
+                column += 1
+                continue
+            kind = rng.choice(("row", "row", "pipe", "stairs"))
+            if kind == "row":
+                width = rng.randint(3, 6)
+                for offset in range(min(width, last - column)):
+                    thing = "Box" if rng.random() < 0.3 else "Brick"
+                    blocks.append({"thing": thing, "x": (column + offset) * TILE, "bottom": 96})
+                    if rng.random() < 0.3:
+                        blocks.append({"thing": "Brick", "x": (column + offset) * TILE, "bottom": 224})
+            elif kind == "pipe":
+                width = 2
+                blocks.append({"thing": "Pipe", "x": column * TILE, "bottom": 0, "type": rng.randint(1, 3)})
+                ground.update((column, column + 1))
+            else:
+                width = min(rng.randint(2, 4), last - column - 1)
+                for offset in range(width):
+                    for height in range(offset + 1):
+                        blocks.append({"thing": "Block", "x": (column + offset) * TILE, "bottom": height * TILE})
+                    ground.add(column + offset)
+            column += width + 2
+
+    for floor in floors:
+        first = floor["x"] // TILE
+        for column in range(max(first, START_COLUMNS + 6), min(first + floor["width"], length - END_COLUMNS)):
+            if column not in ground and rng.random() < enemy_density:
+                thing = "Turtle" if rng.random() < 0.15 else "Mushroom"
+                creatures.append({"thing": thing, "x": column * TILE, "bottom": 0})
+
+    castle_x = (length - 12) * TILE
+    for x in range(0, castle_x, 16 * TILE):
+        scenery = rng.choice((("Hill", rng.randint(1, 2)), ("Bush", rng.randint(1, 3))))
+        images.append({"name": scenery[0], "type": scenery[1], "x": x + rng.randint(0, 8) * TILE, "bottom": 0})
+        images.append({"name": "Cloud", "type": rng.randint(1, 3), "x": x + rng.randint(0, 12) * TILE,
+                       "bottom": rng.randint(240, 310)})
+    images.append({"name": "Castle", "x": castle_x, "bottom": 0})
+
+    return {
+        "time": time,
+        "world": world,
+        "lives": 3,
+        "level_end": castle_x + 2 * TILE,
+        "player": {"x": 2 * TILE},
+        "groups": {"floor": floors, "images": images, "blocks": blocks, "creatures": creatures},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a stress-test level in the map.json format")
+    parser.add_argument("output")
+    parser.add_argument("--length", type=int, default=200, help="level length in 32px tiles")
+    parser.add_argument("--tile-density", type=float, default=0.08, help="chance to start a block feature per tile")
+    parser.add_argument("--enemy-density", type=float, default=0.05, help="chance of an enemy per floor tile")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    game_map = generate(args.length, args.tile_density, args.enemy_density, args.seed)
+    with open(args.output, "w") as level_file:
+        json.dump(game_map, level_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import argparse
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+from mario.world import World, Inputs
+
+MAGIC = b"MREC"
+VERSION = 1
+HEADER = struct.Struct("<4sBHB")
+COUNT = struct.Struct("<I")
+RUN = struct.Struct("<BH")
+
+LEFT = 1
+RIGHT = 2
+UP = 4
+RESTART = 8
+PAUSE = 16
+
+
+def pack_inputs(inputs):
+    return (LEFT * bool(inputs.left) | RIGHT * bool(inputs.right) | UP * bool(inputs.up) |
+            RESTART * bool(inputs.restart) | PAUSE * bool(inputs.pause))
+
+
+def unpack_inputs(flags):
+    return Inputs(bool(flags & LEFT), bool(flags & RIGHT), bool(flags & UP), bool(flags & RESTART), bool(flags & PAUSE))
+
+
+def world_hash(world):
+    player = world.player
+    state = struct.pack("<4i2d3id", *player.rect, player.speed_x, player.speed_y, player.score, player.coins,
+                        world.lives, world.time)
+    for creature in world.creatures:
+        state += struct.pack("<4i", *creature.rect)
+    return zlib.crc32(state)
+
+
+class Recorder:
+    def __init__(self, path, level):
+        self.path = path
+        self.level = level
+        self.runs = []
+        self.hashes = array("I")
+
+    def record(self, inputs, world):
+        flags = pack_inputs(inputs)
+        if self.runs and self.runs[-1][0] == flags and self.runs[-1][1] < 0xFFFF:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([flags, 1])
+        self.hashes.append(world_hash(world))
+
+    def close(self):
+        level = self.level.encode("utf8")
+        with open(self.path, "wb") as replay_file:
+            replay_file.write(HEADER.pack(MAGIC, VERSION, World.TICK_RATE, len(level)) + level)
+            replay_file.write(COUNT.pack(len(self.runs)))
+            for flags, count in self.runs:
+                replay_file.write(RUN.pack(flags, count))
+            replay_file.write(COUNT.pack(len(self.hashes)))
+            replay_file.write(self.hashes.tobytes())
+
+
+class Replay:
+    def __init__(self, path):
+        with open(path, "rb") as replay_file:
+            data = replay_file.read()
+        magic, version, self.tick_rate, level_length = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} replay")
+        if self.tick_rate != World.TICK_RATE:
+            raise ValueError(f"{path} was recorded at {self.tick_rate} ticks per second, not {World.TICK_RATE}")
+        offset = HEADER.size
+        self.level = data[offset:offset + level_length].decode("utf8")
+        offset += level_length
+        runs_count, = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        self.runs = list(RUN.iter_unpack(data[offset:offset + runs_count * RUN.size]))
+        offset += runs_count * RUN.size
+        hashes_count, = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        self.hashes = array("I")
+        self.hashes.frombytes(data[offset:offset + hashes_count * self.hashes.itemsize])
+
+    def __len__(self):
+        return sum(count for flags, count in self.runs)
+
+    def inputs(self):
+        for flags, count in self.runs:
+            inputs = unpack_inputs(flags)
+            for _ in range(count):
+                yield inputs
+
+    def world(self, batch_enemies=False):
+        world = World(self.level, batch_enemies=batch_enemies)
+        world.begin()
+        return world
+
+    def verify(self, batch_enemies=False):
+        world = self.world(batch_enemies)
+        for tick, inputs in enumerate(self.inputs()):
+            world.step(inputs)
+            if tick < len(self.hashes) and world_hash(world) != self.hashes[tick]:
+                return tick
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the frame hashes of a recorded game")
+    parser.add_argument("replay", help="recording made with main.py --record")
+    parser.add_argument("--batch-enemies", action="store_true", help="simulate enemies with the NumPy enemy engine")
+    args = parser.parse_args(argv)
+    replay = Replay(args.replay)
+    start = time.perf_counter()
+    mismatch = replay.verify(args.batch_enemies)
+    elapsed = time.perf_counter() - start
+    print(f"{len(replay)} ticks in {elapsed:.2f} s ({len(replay) / elapsed:.0f} ticks/s, "
+          f"{len(replay) / elapsed / replay.tick_rate:.0f}x real time)")
+    if mismatch is None:
+        print("all frame hashes match")
+        return 0
+    print(f"frame hash mismatch at tick {mismatch}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
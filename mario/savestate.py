@@ -0,0 +1,168 @@
+import os
+import struct
+
+from mario.camera import Camera
+from mario.sprites import Player, Box, Coin, Enemy, Mushroom, Turtle
+
+MAGIC = b"MSAV"
+VERSION = 1
+HEADER = struct.Struct("<4sB20s")
+WORLD = struct.Struct("<idiIi??I")
+PLAYER = struct.Struct("<iiddidiiiBB")
+SPRITE = struct.Struct("<BiiiiiBB")
+
+KINDS = (Box, Coin, Mushroom, Turtle)
+PLAYER_KIND = 255
+NO_IMAGE = 255
+PLAYER_FLAGS = ("on_ground", "jump_ban", "is_left", "is_right", "is_die", "die_animation", "jump_music_play")
+SPRITE_FLAGS = ("is_die", "is_active", "asleep")
+SLOT_PATH = "mario/saves/slot{}.sav"
+
+
+def pack_flags(sprite, names):
+    flags = 0
+    for bit, name in enumerate(names):
+        if getattr(sprite, name, False):
+            flags |= 1 << bit
+    return flags
+
+
+def unpack_flags(sprite, names, flags):
+    for bit, name in enumerate(names):
+        if hasattr(sprite, name):
+            setattr(sprite, name, bool(flags & 1 << bit))
+
+
+def images_of(sprite):
+    images = []
+    for name in ("images", "left_move_images", "right_move_images"):
+        images.extend(getattr(sprite, name, ()))
+    for name in ("die_image", "right_stand_image", "left_stand_image"):
+        if getattr(sprite, name, None) is not None:
+            images.append(getattr(sprite, name))
+    return images
+
+
+def image_index(sprite):
+    image = sprite.image
+    for index, candidate in enumerate(images_of(sprite)):
+        if candidate is image:
+            return index
+    return NO_IMAGE
+
+
+def counter_name(kind):
+    return "timer" if kind is Coin else "animation_frame"
+
+
+def dumps(world):
+    player = world.player
+    output = [HEADER.pack(MAGIC, VERSION, world.level_file.digest),
+              WORLD.pack(world.lives, world.time, world.timer, world.spawn_index, world.camera.x, world.game_end,
+                         world.pause, len(world.all_sprites)),
+              PLAYER.pack(player.rect.x, player.rect.y, player.speed_x, player.speed_y, player.jump_force,
+                          player.left_border_x, player.animation_frame, player.score, player.coins,
+                          pack_flags(player, PLAYER_FLAGS), image_index(player))]
+    for sprite in world.all_sprites.sprites():
+        if sprite is player:
+            output.append(SPRITE.pack(PLAYER_KIND, 0, 0, 0, 0, 0, 0, 0))
+            continue
+        kind = getattr(sprite, "sprite_type", type(sprite))
+        output.append(SPRITE.pack(KINDS.index(kind), sprite.rect.x, sprite.rect.y, getattr(sprite, "speed_x", 0),
+                                  getattr(sprite, "speed_y", 0), getattr(sprite, counter_name(kind)),
+                                  pack_flags(sprite, SPRITE_FLAGS), image_index(sprite)))
+    return b"".join(output)
+
+
+def load_player(world, data, offset):
+    (x, y, speed_x, speed_y, jump_force, left_border_x, animation_frame, score, coins, flags,
+     image) = PLAYER.unpack_from(data, offset)
+    player = Player(x, 0, world.CAMERA_WIDTH, score, coins)
+    player.rect.topleft = x, y
+    player.speed_x = speed_x
+    player.speed_y = speed_y
+    player.jump_force = jump_force
+    player.left_border_x = left_border_x
+    player.animation_frame = animation_frame
+    unpack_flags(player, PLAYER_FLAGS, flags)
+    if image != NO_IMAGE:
+        player.image = images_of(player)[image]
+    return player
+
+
+def load_sprite(kind, x, y, speed_x, speed_y, counter, flags, image):
+    sprite = kind(x, 0, 0) if issubclass(kind, Enemy) else kind(x, 0)
+    sprite.rect.topleft = x, y
+    if issubclass(kind, Enemy):
+        sprite.speed_x = speed_x
+        sprite.speed_y = speed_y
+    setattr(sprite, counter_name(kind), counter)
+    unpack_flags(sprite, SPRITE_FLAGS, flags)
+    if image != NO_IMAGE:
+        sprite.image = images_of(sprite)[image]
+    return sprite
+
+
+def parse(world, data):
+    magic, version, digest = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not a version {VERSION} save state")
+    if digest != world.level_file.digest:
+        raise ValueError(f"save state is not for {world.level}")
+    offset = HEADER.size
+    state = WORLD.unpack_from(data, offset)
+    count = state[-1]
+    if len(data) != HEADER.size + WORLD.size + PLAYER.size + count * SPRITE.size:
+        raise ValueError(f"save state has {len(data)} bytes, expected {count} sprite records")
+    offset += WORLD.size
+    player = load_player(world, data, offset)
+    offset += PLAYER.size
+    sprites = []
+    for record in SPRITE.iter_unpack(data[offset:]):
+        if record[0] == PLAYER_KIND:
+            sprites.append((Player, player))
+            continue
+        kind = KINDS[record[0]]
+        sprites.append((kind, load_sprite(kind, *record[1:])))
+    return state[:-1], player, sprites
+
+
+def loads(world, data):
+    if world.level_file is None:
+        world.load_level()
+    try:
+        state, player, sprites = parse(world, data)
+    except (struct.error, IndexError) as error:
+        raise ValueError(f"corrupt save state: {error}") from error
+    world.lives, world.time, world.timer, world.spawn_index, camera_x, world.game_end, world.pause = state
+    world.clear_sprites()
+    for kind, sprite in sprites:
+        if kind is Box:
+            world.add_block(sprite)
+        elif issubclass(kind, Enemy):
+            world.add_creature(sprite)
+        else:
+            world.all_sprites.add(sprite)
+    world.player = player
+    world.score = player.score
+    world.coins = player.coins
+    world.camera = Camera(player, camera_x, 0, world.CAMERA_WIDTH, world.HEIGHT, world.level_file.width)
+
+
+def slot_path(slot):
+    return SLOT_PATH.format(slot)
+
+
+def save(path, world):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path + ".tmp", "wb") as state_file:
+        state_file.write(dumps(world))
+    os.replace(path + ".tmp", path)
+
+
+def load(path, world):
+    with open(path, "rb") as state_file:
+        world.load_state(state_file.read())
+
@@ -0,0 +1,75 @@
+import io
+
+import pygame
+
+
+class SoundBank:
+    EFFECTS = {"jump": 1, "coin": 2, "kill": 2, "lose": 3}
+    MUSIC = ("fon", "win", "gameover")
+
+    def __init__(self, path="mario/sounds", channels=8):
+        self.path = path
+        self.channels_count = channels
+        self.sounds = {}
+        self.music = {}
+        self.channels = []
+        self.priorities = []
+        self.started = []
+        self.plays = 0
+        self.music_name = None
+
+    def load(self):
+        if not pygame.mixer.get_init():
+            return
+        pygame.mixer.set_num_channels(self.channels_count)
+        self.channels = [pygame.mixer.Channel(number) for number in range(self.channels_count)]
+        self.priorities = [0] * self.channels_count
+        self.started = [0] * self.channels_count
+        for name in self.EFFECTS:
+            self.sounds[name] = pygame.mixer.Sound(f"{self.path}/{name}.mp3")
+        for name in self.MUSIC:
+            with open(f"{self.path}/{name}.mp3", "rb") as music_file:
+                self.music[name] = music_file.read()
+
+    def play(self, name):
+        sound = self.sounds.get(name)
+        if sound is None:
+            return
+        number = self.find_channel(self.EFFECTS[name])
+        if number is None:
+            return
+        self.plays += 1
+        self.priorities[number] = self.EFFECTS[name]
+        self.started[number] = self.plays
+        self.channels[number].play(sound)
+
+    def find_channel(self, priority):
+        stolen = None
+        for number, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return number
+            if self.priorities[number] > priority:
+                continue
+            if stolen is None or (self.priorities[number], self.started[number]) < \
+                    (self.priorities[stolen], self.started[stolen]):
+                stolen = number
+        return stolen
+
+    def play_music(self, name):
+        if name not in self.music:
+            return
+        if self.music_name != name:
+            pygame.mixer.music.load(io.BytesIO(self.music[name]), "mp3")
+            self.music_name = name
+        pygame.mixer.music.play()
+
+    def stop_music(self):
+        if pygame.mixer.get_init():
+            pygame.mixer.music.stop()
+
+    def stop(self):
+        if pygame.mixer.get_init():
+            pygame.mixer.stop()
+
+
+sounds = SoundBank()
@@ -2,10 +2,16 @@ import math
 
 import pygame
 
+from mario.assets import assets
+
 GRAVITY = 5
 
 
 class BasicMovableSprite(pygame.sprite.Sprite):
+    static = False
+    asleep = False
+    batched = False
+
     def __init__(self, screen_width):
         pygame.sprite.Sprite.__init__(self)
         self.screen_width = screen_width
@@ -48,15 +54,13 @@ class BasicMovableSprite(pygame.sprite.Sprite):
 class Player(BasicMovableSprite):
     def __init__(self, x, bottom, screen_width, score, coins):
         BasicMovableSprite.__init__(self, screen_width)
-        self.image = pygame.image.load("mario/images/mario1.png")
+        self.image = assets.image("mario1")
         self.right_stand_image = self.image
-        self.left_stand_image = pygame.transform.flip(self.image, True, False)
+        self.left_stand_image = assets.flipped("mario1")
         for frame_number in range(2, 7):
-            image = pygame.image.load(f"mario/images/mario{frame_number}.png")
-            self.right_move_images.append(image)
-        for image in self.right_move_images:
-            self.left_move_images.append(pygame.transform.flip(image, True, False))
-        self.die_image = pygame.image.load(f"mario/images/mario_die.png")
+            self.right_move_images.append(assets.image(f"mario{frame_number}"))
+            self.left_move_images.append(assets.flipped(f"mario{frame_number}"))
+        self.die_image = assets.image("mario_die")
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.bottom = bottom
@@ -64,15 +68,16 @@ class Player(BasicMovableSprite):
         self.coins = coins
         self.die_animation = False
         self.jump_music_play = False
+        self.events = []
 
-    def update(self, all_sprites, blocks, creatures, **kwargs):
+    def update(self, all_sprites, blocks, creatures, inputs, **kwargs):
         self.move(all_sprites, blocks)
         if not self.die_animation:
-            self.change_direction()
+            self.change_direction(inputs)
             self.enemy_collide(creatures)
-            self.jump()
+            self.jump(inputs)
             self.border()
-        self.animate()
+        self.animate(inputs)
 
     def move(self, all_sprites, blocks):
         if self.speed_x < 0:
@@ -92,14 +97,13 @@ class Player(BasicMovableSprite):
             self.box_collide(self.speed_y, blocks, all_sprites)
             self.collide(0, self.speed_y, blocks)
 
-    def change_direction(self):
-        key_state = pygame.key.get_pressed()
-        if key_state[pygame.K_LEFT] or key_state[pygame.K_a]:
+    def change_direction(self, inputs):
+        if inputs.left:
             if self.speed_x > -40:
                 self.speed_x -= 1
             self.is_left = True
             self.is_right = False
-        elif key_state[pygame.K_RIGHT] or key_state[pygame.K_d]:
+        elif inputs.right:
             if self.speed_x < 40:
                 self.speed_x += 1
             self.is_left = False
@@ -109,21 +113,18 @@ class Player(BasicMovableSprite):
         else:
             self.speed_x += math.copysign(1.5 * -1, -1 * self.speed_x)
 
-    def jump(self):
-        key_state = pygame.key.get_pressed()
-
-        if (key_state[pygame.K_UP] or key_state[pygame.K_w]) and self.jump_force < 5 * 30 and not self.jump_ban:
+    def jump(self, inputs):
+        if inputs.up and self.jump_force < 5 * 30 and not self.jump_ban:
             self.jump_force += 6
             self.speed_y = -6 - GRAVITY
             self.on_ground = False
             if not self.jump_music_play:
-                sound = pygame.mixer.Sound("mario/sounds/jump.mp3")
-                sound.play()
+                self.events.append("jump")
                 self.jump_music_play = True
         else:
             self.jump_ban = True
 
-        if not (key_state[pygame.K_UP] or key_state[pygame.K_w]) and self.on_ground:
+        if not inputs.up and self.on_ground:
             self.jump_ban = False
             self.jump_music_play = False
 
@@ -134,7 +135,7 @@ class Player(BasicMovableSprite):
             self.left_border_x = self.rect.right - self.screen_width / 2
 
     def collide(self, speed_x, speed_y, blocks):
-        collided_sprites = pygame.sprite.spritecollide(self, blocks, False)
+        collided_sprites = blocks.collide(self)
         for sprite in collided_sprites:
             if speed_x > 0:
                 self.rect.right = sprite.rect.left
@@ -160,7 +161,7 @@ class Player(BasicMovableSprite):
         return False
 
     def box_collide(self, speed_y, blocks, all_sprites):
-        collided_sprites = pygame.sprite.spritecollide(self, blocks, False)
+        collided_sprites = blocks.collide(self)
         for sprite in collided_sprites:
             if speed_y < 0 and isinstance(sprite, Box):
                 self.rect.top = sprite.rect.bottom
@@ -171,16 +172,16 @@ class Player(BasicMovableSprite):
                 all_sprites.add(coin)
                 self.score += 200
                 coin.is_die = True
-                pygame.mixer.Sound("mario/sounds/coin.mp3").play()
+                self.events.append("coin")
 
     def enemy_collide(self, enemies):
-        collided_sprites = pygame.sprite.spritecollide(self, enemies, False)
+        collided_sprites = enemies.collide(self)
         for sprite in collided_sprites:
             if self.rect.bottom - 10 < sprite.rect.top and not sprite.is_die:
                 sprite.is_die = True
                 sprite.animation_frame = 0
                 self.speed_y = -GRAVITY * 3
-                pygame.mixer.Sound("mario/sounds/kill.mp3").play()
+                self.events.append("kill")
                 self.score += 200
                 self.coins += 1
             elif not self.die_animation and not sprite.is_die:
@@ -191,12 +192,10 @@ class Player(BasicMovableSprite):
         self.speed_y = -GRAVITY * 4
         self.animation_frame = 0
         self.speed_x = 0
-        pygame.mixer.music.stop()
-        pygame.mixer.Sound("mario/sounds/lose.mp3").play()
+        self.events.append("die")
 
-    def animate(self):
+    def animate(self, inputs):
         self.animation_frame += 1
-        key_state = pygame.key.get_pressed()
 
         if self.die_animation:
             self.image = self.die_image
@@ -213,11 +212,11 @@ class Player(BasicMovableSprite):
             elif self.is_right:
                 self.image = self.right_move_images[4]
 
-        elif (key_state[pygame.K_RIGHT] or key_state[pygame.K_d]) and self.speed_x < 0:
+        elif inputs.right and self.speed_x < 0:
             self.image = self.right_move_images[3]
             self.animation_frame = 0
 
-        elif (key_state[pygame.K_LEFT] or key_state[pygame.K_a]) and self.speed_x > 0:
+        elif inputs.left and self.speed_x > 0:
             self.image = self.left_move_images[3]
             self.animation_frame = 0
 
@@ -229,6 +228,10 @@ class Player(BasicMovableSprite):
 
 
 class BasicBlock(pygame.sprite.Sprite):
+    static = True
+    asleep = False
+    batched = False
+
     def __init__(self):
         pygame.sprite.Sprite.__init__(self)
         self.images = []
@@ -247,39 +250,33 @@ class BasicBlock(pygame.sprite.Sprite):
             self.image = self.images[self.animation_frame // 12 % len(self.images)]
 
 
-class Block(BasicBlock):
-    def __init__(self, x, bottom):
-        BasicBlock.__init__(self)
-        self.image = pygame.image.load("mario/images/block.png")
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.bottom = bottom
-
-
 class Box(BasicBlock):
+    static = False
+
     def __init__(self, x, bottom):
         BasicBlock.__init__(self)
-        self.image = pygame.image.load("mario/images/box4.png")
+        self.image = assets.image("box4")
         for frame_number in range(1, 5):
-            image = pygame.image.load(f"mario/images/box{frame_number}.png")
-            self.images.append(image)
-        self.images.append(pygame.image.load(f"mario/images/box4.png"))
-        self.die_image = pygame.image.load(f"mario/images/box5.png")
+            self.images.append(assets.image(f"box{frame_number}"))
+        self.images.append(assets.image("box4"))
+        self.die_image = assets.image("box5")
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.bottom = bottom
 
     def update(self, **kwargs):
         self.animate()
+        self.asleep = self.is_die
 
 
 class Coin(BasicBlock):
+    static = False
+
     def __init__(self, x, bottom):
         BasicBlock.__init__(self)
-        self.image = pygame.image.load("mario/images/coin1.png")
+        self.image = assets.image("coin1")
         for frame_number in range(1, 6):
-            image = pygame.image.load(f"mario/images/coin{frame_number}.png")
-            self.images.append(image)
+            self.images.append(assets.image(f"coin{frame_number}"))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.bottom = bottom
@@ -299,36 +296,10 @@ class Coin(BasicBlock):
             self.kill()
 
 
-class Brick(BasicBlock):
-    def __init__(self, x, bottom):
+class Solid(BasicBlock):
+    def __init__(self, x, bottom, width, height):
         BasicBlock.__init__(self)
-        self.image = pygame.image.load("mario/images/brick.png")
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.bottom = bottom
-
-
-class Floor(BasicBlock):
-    def __init__(self, x, bottom):
-        BasicBlock.__init__(self)
-        self.image = pygame.image.load("mario/images/floor.png")
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.bottom = bottom
-
-
-class Pipe(BasicBlock):
-    def __init__(self, x, bottom, pipe_type):
-        BasicBlock.__init__(self)
-        if pipe_type == 1:
-            self.image = pygame.image.load("mario/images/pipe1.png")
-        if pipe_type == 2:
-            self.image = pygame.image.load("mario/images/pipe2.png")
-        if pipe_type == 3:
-            self.image = pygame.image.load("mario/images/pipe3.png")
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.bottom = bottom
+        self.rect = pygame.Rect(x, bottom - height, width, height)
 
 
 class Enemy(BasicMovableSprite):
@@ -338,12 +309,14 @@ class Enemy(BasicMovableSprite):
         self.speed_y = GRAVITY
 
     def update(self, blocks, camera, **kwargs):
+        position = self.rect.topleft
         self.move(blocks)
         self.animate()
 
         if not self.is_active and pygame.Rect.colliderect(self.rect, camera.rect):
             self.speed_x = -1
             self.is_active = True
+        self.asleep = not self.is_active and self.rect.topleft == position
 
     def move(self, blocks):
         self.rect.y += self.speed_y
@@ -357,7 +330,7 @@ class Enemy(BasicMovableSprite):
         self.speed_x *= -1
 
     def collide(self, speed_x, speed_y, blocks):
-        collided_sprites = pygame.sprite.spritecollide(self, blocks, False)
+        collided_sprites = blocks.collide(self)
         for sprite in collided_sprites:
             if speed_x > 0:
                 self.rect.right = sprite.rect.left
@@ -378,13 +351,11 @@ class Enemy(BasicMovableSprite):
 class Turtle(Enemy):
     def __init__(self, x, bottom, screen_width):
         Enemy.__init__(self, screen_width)
-        self.image = pygame.image.load("mario/images/turtle1.png")
+        self.image = assets.image("turtle1")
         for frame_number in range(1, 3):
-            image = pygame.image.load(f"mario/images/turtle{frame_number}.png")
-            self.left_move_images.append(image)
-        for image in self.left_move_images:
-            self.right_move_images.append(pygame.transform.flip(image, True, False))
-        self.die_image = pygame.image.load(f"mario/images/turtle3.png")
+            self.left_move_images.append(assets.image(f"turtle{frame_number}"))
+            self.right_move_images.append(assets.flipped(f"turtle{frame_number}"))
+        self.die_image = assets.image("turtle3")
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.bottom = bottom
@@ -393,13 +364,11 @@ class Turtle(Enemy):
 class Mushroom(Enemy):
     def __init__(self, x, bottom, screen_width):
         Enemy.__init__(self, screen_width)
-        self.image = pygame.image.load("mario/images/mushroom1.png")
+        self.image = assets.image("mushroom1")
         for frame_number in range(1, 3):
-            image = pygame.image.load(f"mario/images/mushroom{frame_number}.png")
-            self.left_move_images.append(image)
-        for image in self.left_move_images:
-            self.right_move_images.append(pygame.transform.flip(image, True, False))
-        self.die_image = pygame.image.load(f"mario/images/mushroom3.png")
+            self.left_move_images.append(assets.image(f"mushroom{frame_number}"))
+            self.right_move_images.append(assets.flipped(f"mushroom{frame_number}"))
+        self.die_image = assets.image("mushroom3")
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.bottom = bottom
@@ -407,14 +376,34 @@ class Mushroom(Enemy):
 
 class Button:
     def __init__(self, screen_width, y, text, font):
-        self.text = text
         self.font = font
-        self.image = self.font.render(text, True, (255, 255, 255))
-        self.rect = self.image.get_rect()
-        self.rect.x = screen_width / 2 - self.rect.width / 2
-        self.rect.y = y
-        self.text_surface = None
-        self.text_background = None
+        self.screen_width = screen_width
+        self.rect = pygame.Rect(0, y, 0, 0)
+        self.image = None
+        self.hover_image = None
+        self.text = text
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, text):
+        self._text = text
+        text_surface = self.font.render(text, True, (255, 255, 255))
+        self.rect.size = text_surface.get_size()
+        self.rect.x = self.screen_width / 2 - self.rect.width / 2
+        self.image = self.render_state(text_surface, (0, 0, 0))
+        self.hover_image = self.render_state(text_surface, (255, 255, 255))
+        self.focused = None
+
+    @staticmethod
+    def render_state(text_surface, border_color):
+        image = pygame.Surface((text_surface.get_width() + 6, text_surface.get_height() + 6))
+        image.fill(border_color)
+        image.fill((0, 0, 0), pygame.Rect((3, 3), text_surface.get_size()))
+        image.blit(text_surface, (3, 3))
+        return image
 
     def in_focus(self, mouse):
         if self.rect.left < mouse[0] < self.rect.right:
@@ -423,12 +412,11 @@ class Button:
         else:
             return False
 
-    def draw(self, screen, mouse):
-        self.text_surface = self.font.render(self.text, True, (255, 255, 255))
-        self.image = pygame.Surface((self.text_surface.get_width() + 6, self.text_surface.get_height() + 6))
-        self.text_background = pygame.Surface(self.text_surface.get_size())
-        if self.in_focus(mouse):
-            self.image.fill((255, 255, 255))
-        self.image.blit(self.text_background, (3, 3))
-        self.image.blit(self.text_surface, (3, 3))
-        screen.blit(self.image, (self.rect.x, self.rect.y))
+    def draw(self, screen, mouse, force=True):
+        focused = bool(self.in_focus(mouse))
+        if not force and focused == self.focused:
+            return None
+        self.focused = focused
+        if focused:
+            return screen.blit(self.hover_image, (self.rect.x, self.rect.y))
+        return screen.blit(self.image, (self.rect.x, self.rect.y))
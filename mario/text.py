@@ -0,0 +1,153 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class FontMetrics:
+    def __init__(self, font):
+        self.font = font
+        self.sizes = {}
+        self.kerning = {}
+
+    def size(self, text):
+        size = self.sizes.get(text)
+        if size is None:
+            size = self.sizes[text] = self.font.size(text)
+        return size
+
+    def advance(self, character):
+        return self.size(character)[0]
+
+    def pair(self, left, right):
+        kerning = self.kerning.get((left, right))
+        if kerning is None:
+            kerning = self.font.size(left + right)[0] - self.advance(left) - self.advance(right)
+            self.kerning[left, right] = kerning
+        return kerning
+
+    def width(self, text, previous=None):
+        width = 0
+        for character in text:
+            width += self.advance(character)
+            if previous is not None:
+                width += self.pair(previous, character)
+            previous = character
+        return width
+
+
+class TextLayout:
+    CACHE_SIZE = 64
+
+    def __init__(self, cache_size=CACHE_SIZE):
+        self.cache_size = cache_size
+        self.metrics = {}
+        self.layouts = OrderedDict()
+        self.surfaces = OrderedDict()
+
+    def metrics_for(self, font):
+        metrics = self.metrics.get(font)
+        if metrics is None:
+            metrics = self.metrics[font] = FontMetrics(font)
+        return metrics
+
+    def cached(self, cache, key):
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+    def store(self, cache, key, value):
+        cache[key] = value
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return value
+
+    def fits(self, words, metrics, width):
+        return metrics.size(" ".join(words) + " ")[0] < width
+
+    def estimate_break(self, words, start, metrics, width):
+        estimate = 0
+        previous = None
+        end = start
+        while end < len(words):
+            estimate += metrics.width(words[end] + " ", previous)
+            if estimate >= width:
+                break
+            previous = " "
+            end += 1
+        return end
+
+    def wrap(self, line, metrics, width):
+        words = line.split(" ")
+        for word in words:
+            if metrics.size(word)[0] >= width:
+                raise Exception("The word " + word + " is too long to fit in the rect passed.")
+        lines = []
+        start = 0
+        while start < len(words):
+            shortest = start + 1 if lines else start
+            end = max(self.estimate_break(words, start, metrics, width), shortest)
+            while end > shortest and not self.fits(words[start:end], metrics, width):
+                end -= 1
+            while end < len(words) and self.fits(words[start:end + 1], metrics, width):
+                end += 1
+            lines.append(" ".join(words[start:end]) + " " if end > start else "")
+            start = end
+        return lines
+
+    def layout(self, text, font, width, height, justification=0):
+        key = (text, font, width, height, justification)
+        placed = self.cached(self.layouts, key)
+        if placed is not None:
+            return placed
+        metrics = self.metrics_for(font)
+        lines = []
+        for requested_line in text.splitlines():
+            if metrics.size(requested_line)[0] > width:
+                lines.extend(self.wrap(requested_line, metrics, width))
+            else:
+                lines.append(requested_line)
+        placed = []
+        y = 0
+        for line in lines:
+            line_width, line_height = metrics.size(line)
+            if y + line_height >= height:
+                raise Exception("Once word-wrapped, the text string was too tall to fit in the rect.")
+            if justification == 0:
+                x = 0
+            elif justification == 1:
+                x = (width - line_width) / 2
+            elif justification == 2:
+                x = width - line_width
+            else:
+                raise Exception("Invalid justification argument: " + str(justification))
+            placed.append((line, x, y))
+            y += line_height
+        return self.store(self.layouts, key, tuple(placed))
+
+    def render(self, text, font, rect, font_color, bg_color, justification=0):
+        key = (text, font, tuple(rect.size), tuple(font_color), bg_color and tuple(bg_color), justification)
+        surface = self.cached(self.surfaces, key)
+        if surface is not None:
+            return surface
+        placed = self.layout(text, font, rect.width, rect.height, justification)
+        surface = pygame.Surface(rect.size, pygame.SRCALPHA, 32)
+        surface = surface.convert_alpha()
+        if bg_color is not None:
+            surface.fill(bg_color)
+        for line, x, y in placed:
+            surface.blit(font.render(line, True, font_color), (x, y))
+        return self.store(self.surfaces, key, surface)
+
+    def clear(self):
+        self.metrics.clear()
+        self.layouts.clear()
+        self.surfaces.clear()
+
+
+text_layout = TextLayout()
+
+
+def multiline_surface(text: str, font: pygame.font.Font, rect: pygame.rect.Rect, font_color: tuple, bg_color: tuple,
+                      justification=0):
+    return text_layout.render(text, font, rect, font_color, bg_color, justification)
@@ -0,0 +1,89 @@
+from mario.assets import assets
+
+
+class TileLayer:
+    CELL_SIZE = 32
+    COVERED = 255
+
+    def __init__(self, origin_y=0):
+        self.origin_y = origin_y
+        self.names = []
+        self.images = []
+        self.ids = {}
+        self.rows = {}
+        self.loose = []
+        self.count = 0
+        self.max_width = self.CELL_SIZE
+        self.right = 0
+
+    def __len__(self):
+        return self.count
+
+    def tile_id(self, name):
+        tile_id = self.ids.get(name)
+        if tile_id is None:
+            self.names.append(name)
+            self.images.append(assets.image(name))
+            tile_id = self.ids[name] = len(self.images)
+        return tile_id
+
+    def footprint(self, x, y, image):
+        columns = range(max(x // self.CELL_SIZE, 0), (x + image.get_width() - 1) // self.CELL_SIZE + 1)
+        rows = range((y - self.origin_y) // self.CELL_SIZE, (y + image.get_height() - 1 - self.origin_y) //
+                     self.CELL_SIZE + 1)
+        return columns, rows
+
+    def cells(self, row, size):
+        cells = self.rows.get(row)
+        if cells is None:
+            cells = self.rows[row] = bytearray()
+        if len(cells) < size:
+            cells.extend(bytes(size - len(cells)))
+        return cells
+
+    def add(self, name, x, y):
+        tile_id = self.tile_id(name)
+        image = self.images[tile_id - 1]
+        self.max_width = max(self.max_width, image.get_width())
+        self.right = max(self.right, x + image.get_width())
+        self.count += 1
+        columns, rows = self.footprint(x, y, image)
+        aligned = x >= 0 and not x % self.CELL_SIZE and not (y - self.origin_y) % self.CELL_SIZE
+        if aligned and tile_id < self.COVERED and not any(self.cell(row, column) for row in rows for column in columns):
+            for row in rows:
+                self.cells(row, columns.stop)[columns.start:columns.stop] = bytes([self.COVERED]) * len(columns)
+            self.rows[rows.start][columns.start] = tile_id
+            return
+        self.loose.append((tile_id, x, y))
+        for row in rows:
+            cells = self.cells(row, columns.stop)
+            for column in columns:
+                if not cells[column]:
+                    cells[column] = self.COVERED
+
+    def cell(self, row, column):
+        cells = self.rows.get(row)
+        if cells is None or column >= len(cells):
+            return 0
+        return cells[column]
+
+    def tiles_in(self, left, right):
+        images = self.images
+        first = max((left - self.max_width) // self.CELL_SIZE + 1, 0)
+        last = (right - 1) // self.CELL_SIZE + 1
+        for row, cells in self.rows.items():
+            y = row * self.CELL_SIZE + self.origin_y
+            for column in range(first, min(last, len(cells))):
+                tile_id = cells[column]
+                if tile_id and tile_id != self.COVERED:
+                    image = images[tile_id - 1]
+                    x = column * self.CELL_SIZE
+                    if x + image.get_width() > left:
+                        yield image, x, y
+        for tile_id, x, y in self.loose:
+            image = images[tile_id - 1]
+            if x < right and x + image.get_width() > left:
+                yield image, x, y
+
+    def tiles(self):
+        return self.tiles_in(min([0] + [x for tile_id, x, y in self.loose]), self.right)
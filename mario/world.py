@@ -0,0 +1,291 @@
+import pygame
+
+from mario.assets import assets
+from mario.camera import Camera
+from mario import levelfile, savestate
+from mario.enemies import EnemyEngine, numpy
+from mario.groups import OffsetGroup, TileGroup, SpatialHashGroup
+from mario.sprites import Player, Box, Mushroom, Turtle, Solid
+from mario.tiles import TileLayer
+
+
+class Inputs:
+    def __init__(self, left=False, right=False, up=False, restart=False, pause=False):
+        self.left = left
+        self.right = right
+        self.up = up
+        self.restart = restart
+        self.pause = pause
+
+    @staticmethod
+    def from_keys(key_state, restart=False, pause=False):
+        return Inputs(key_state[pygame.K_LEFT] or key_state[pygame.K_a],
+                      key_state[pygame.K_RIGHT] or key_state[pygame.K_d],
+                      key_state[pygame.K_UP] or key_state[pygame.K_w],
+                      restart, pause)
+
+
+class Snapshot:
+    def __init__(self, time, player_x, camera_x, records):
+        self.time = time
+        self.player_x = player_x
+        self.camera_x = camera_x
+        self.records = records
+
+
+class World:
+    CAMERA_WIDTH = 1008
+    HEIGHT = 460
+    ZERO_POINT = HEIGHT - 32 * 3 / 2
+    TICK_RATE = 60
+    SPAWN_MARGIN = 256
+    DESPAWN_MARGIN = CAMERA_WIDTH
+    BLOCK_LEAD = 64
+
+    def __init__(self, level="mario/map.json", lives=3, score=0, coins=0,
+                 spawn_margin=SPAWN_MARGIN, despawn_margin=DESPAWN_MARGIN, batch_enemies=False, checkpoint_spacing=0):
+        self.level = level
+        self.level_file = None
+        self.spawn_margin = spawn_margin
+        self.despawn_margin = despawn_margin
+        self.spawn_queue = None
+        self.spawn_index = 0
+        self.updated = 0
+        self.lives = lives
+        self.score = score
+        self.coins = coins
+        self.time = 0
+        self.timer = 0
+        self.name = ""
+        self.level_end = 0
+        self.game_end = False
+        self.pause = False
+        self.player = None
+        self.camera = None
+        self.previous_camera_x = 0
+        self.all_sprites = OffsetGroup()
+        self.blocks = TileGroup()
+        self.creatures = SpatialHashGroup()
+        self.enemy_engine = None
+        if batch_enemies and numpy is not None:
+            self.enemy_engine = EnemyEngine(self.blocks, int(self.ZERO_POINT) % 32)
+        self.static_tiles = None
+        self.scenery = []
+        self.snapshot = None
+        self.checkpoint_spacing = checkpoint_spacing
+        self.checkpoint = None
+        self.checkpoint_x = 0
+        self.events = []
+
+    def load_level(self):
+        if self.level_file is None:
+            self.level_file = levelfile.load(self.level)
+        level = self.level_file
+        self.level_end = level.level_end
+        self.time = level.time
+        self.name = level.world
+        self.scenery = list(level.scenery())
+        if self.static_tiles is None:
+            self.static_tiles = self.build_static_tiles(level)
+        self.all_sprites.empty()
+        self.player = Player(level.player_x, self.ZERO_POINT, self.CAMERA_WIDTH, self.score, self.coins)
+        self.blocks.empty()
+        self.creatures.empty()
+        if self.enemy_engine:
+            self.enemy_engine.clear()
+        for x, bottom, width, height in level.spans():
+            self.blocks.add(Solid(x, self.ZERO_POINT - bottom, width, height))
+        if self.spawn_queue is None:
+            self.spawn_queue = self.build_spawn_queue(level)
+        self.spawn_index = 0
+        self.all_sprites.add(self.player)
+
+        self.camera = Camera(self.player, 0, 0, self.CAMERA_WIDTH, self.HEIGHT, level.width)
+        self.stream()
+        self.snapshot = Snapshot(self.time, self.player.rect.x, self.camera.x, self.spawn_queue[:self.spawn_index])
+        self.remember()
+        self.events.append("level")
+
+    def restore(self, snapshot):
+        self.time = snapshot.time
+        self.clear_sprites()
+        self.player = Player(snapshot.player_x, self.ZERO_POINT, self.CAMERA_WIDTH, self.score, self.coins)
+        self.spawn_index = len(snapshot.records)
+        self.spawn(snapshot.records)
+        self.all_sprites.add(self.player)
+        self.camera = Camera(self.player, snapshot.camera_x, 0, self.CAMERA_WIDTH, self.HEIGHT,
+                             self.level_file.width)
+        self.stream()
+        self.remember()
+        self.events.append("respawn")
+
+    def reset(self):
+        if self.snapshot is None:
+            self.load_level()
+        else:
+            self.restore(self.snapshot)
+
+    def build_static_tiles(self, level):
+        tiles = TileLayer(int(self.ZERO_POINT) % 32)
+        for x, width in level.floors():
+            for floor_offset in range(width):
+                add_tile(tiles, "floor", x + 32 * floor_offset, self.HEIGHT + 16)
+                add_tile(tiles, "floor", x + 32 * floor_offset, self.HEIGHT - 16)
+        for thing, variant, x, bottom in level.blocks():
+            if thing in levelfile.SOLIDS:
+                add_tile(tiles, levelfile.IMAGES[thing].format(variant), x, self.ZERO_POINT - bottom)
+        return tiles
+
+    def build_spawn_queue(self, level):
+        queue = [(x - self.BLOCK_LEAD, thing, variant, x, bottom)
+                 for thing, variant, x, bottom in level.blocks() if thing == "Box"]
+        queue.extend((x, thing, variant, x, bottom) for thing, variant, x, bottom in level.creatures())
+        queue.sort(key=lambda record: record[0])
+        return queue
+
+    def stream(self):
+        view = self.camera.rect
+        edge = view.right + self.spawn_margin
+        spawned = self.spawn_index
+        while self.spawn_index < len(self.spawn_queue) and self.spawn_queue[self.spawn_index][0] < edge:
+            self.spawn_index += 1
+        if self.spawn_index != spawned:
+            self.spawn(self.spawn_queue[spawned:self.spawn_index])
+            self.all_sprites.remove(self.player)
+            self.all_sprites.add(self.player)
+
+        behind = view.left - self.despawn_margin
+        for sprite in self.all_sprites.sprites():
+            if sprite.rect.right < behind and sprite is not self.player:
+                sprite.kill()
+            elif sprite.asleep and sprite in self.creatures and view.colliderect(sprite.rect):
+                sprite.asleep = False
+
+    def spawn(self, records):
+        for record in records:
+            sprite = make_sprite(*record[1:])
+            if isinstance(sprite, Box):
+                self.add_block(sprite)
+            else:
+                self.add_creature(sprite)
+
+    def add_block(self, sprite):
+        self.blocks.add(sprite)
+        self.all_sprites.add(sprite)
+
+    def add_creature(self, sprite):
+        if self.enemy_engine:
+            sprite = self.enemy_engine.add(sprite)
+        self.all_sprites.add(sprite)
+        self.creatures.add(sprite)
+
+    def clear_sprites(self):
+        self.blocks.remove(*self.all_sprites.sprites())
+        self.all_sprites.empty()
+        self.creatures.empty()
+        if self.enemy_engine:
+            self.enemy_engine.clear()
+
+    def save_state(self):
+        return savestate.dumps(self)
+
+    def load_state(self, data):
+        savestate.loads(self, data)
+        self.remember()
+        self.events.append("respawn")
+
+    def begin(self):
+        if self.checkpoint is None:
+            self.reset()
+        else:
+            lives = self.lives
+            self.load_state(self.checkpoint)
+            self.lives = lives
+        self.events.append("start")
+        self.game_end = False
+
+    def remember(self):
+        self.previous_camera_x = self.camera.x
+        self.all_sprites.remember()
+
+    def view(self, alpha=1):
+        x = round(self.previous_camera_x + (self.camera.x - self.previous_camera_x) * alpha)
+        return pygame.Rect(x, self.camera.y, self.camera.width, self.camera.height)
+
+    def step(self, inputs):
+        if inputs.restart:
+            self.checkpoint = None
+            self.checkpoint_x = 0
+            self.reset()
+        if inputs.pause:
+            self.pause = not self.pause
+        self.remember()
+        self.score = self.player.score
+        self.coins = self.player.coins
+        if not self.game_end and self.lives >= 0 and not self.pause:
+            self.camera.scroll()
+            self.stream()
+            self.creatures.refresh()
+            if self.enemy_engine:
+                self.enemy_engine.step(self.camera)
+            self.all_sprites.update(blocks=self.blocks, creatures=self.creatures, camera=self.camera,
+                                    all_sprites=self.all_sprites, inputs=inputs)
+            self.updated = self.all_sprites.updated
+            if self.enemy_engine:
+                self.updated += self.enemy_engine.updated
+            self.events.extend(self.player.events)
+            self.player.events.clear()
+            self.time -= 2 / self.TICK_RATE
+        if self.game_end:
+            self.time -= 60 / self.TICK_RATE
+            self.player.score += int(60 / self.TICK_RATE * 50)
+            self.score = self.player.score
+            if self.time <= 0:
+                self.events.append("level_complete")
+        if self.player.is_die:
+            self.lives -= 1
+            self.begin()
+            if self.lives < 0:
+                self.events.append("game_over")
+        if self.lives < 0:
+            self.timer += 1
+            if self.timer > 250:
+                self.timer = 0
+                self.events.append("game_over_end")
+        if self.player.rect.y > self.HEIGHT and not self.player.die_animation:
+            self.player.die()
+            self.events.extend(self.player.events)
+            self.player.events.clear()
+        if self.player.rect.x >= self.level_end and not self.game_end:
+            self.game_end = True
+            self.player.kill()
+            self.events.append("win")
+        if self.checkpoint_spacing and not self.game_end and self.lives >= 0:
+            self.check_checkpoint()
+        return self.take_events()
+
+    def check_checkpoint(self):
+        player = self.player
+        if player.rect.x >= self.checkpoint_x + self.checkpoint_spacing and player.on_ground and \
+                not player.die_animation:
+            self.checkpoint_x = player.rect.x - player.rect.x % self.checkpoint_spacing
+            self.checkpoint = self.save_state()
+            self.events.append("checkpoint")
+
+    def take_events(self):
+        events = self.events
+        self.events = []
+        return events
+
+
+def add_tile(tiles, name, x, bottom):
+    tiles.add(name, x, int(bottom) - assets.image(name).get_height())
+
+
+def make_sprite(thing, variant, x, bottom):
+    if thing == "Box":
+        return Box(x, World.ZERO_POINT - bottom)
+    elif thing == "Mushroom":
+        return Mushroom(x, World.ZERO_POINT - bottom, 0)
+    elif thing == "Turtle":
+        return Turtle(x, World.ZERO_POINT - bottom, 0)
@@ -116,6 +116,10 @@ class TextInputVisualizer:
     The surface itself is lazily re-rendered only when the `.surface` field is 
     accessed, and if any parameters changed since the last `.surface` access, so
     values can freely be changed between renders without performance overhead.
+    The rendered text is kept separately from the cursor, so blinking or moving
+    the cursor only redraws the cursor's few columns, and the pixel offset of
+    each prefix of the input is cached, so only offsets past an edit are
+    measured again.
 
     :param manager: The TextInputManager used to manage the user input
     :param font_object: a pygame.font.Font object used for rendering
@@ -149,7 +153,15 @@ class TextInputVisualizer:
         self._cursor_color = cursor_color
 
         self._surface = pygame.Surface((self._cursor_width, self._font_object.get_height()))
+        self._text_surface = self._surface
+        self._rendered_value = None
+        self._cursor_rect = None
         self._rerender_required = True
+        self._cursor_rerender_required = True
+
+        self._measured_value = ""
+        self._prefix_widths = {0: 0}
+        self._last_cursor_pos = 0
     
     @property
     def value(self):
@@ -159,6 +171,7 @@ class TextInputVisualizer:
     @value.setter
     def value(self, v):
         self.manager.value = v
+        self._require_rerender()
     
     @property
     def manager(self):
@@ -172,10 +185,18 @@ class TextInputVisualizer:
     @property
     def surface(self):
         """ Get the surface with the rendered user input """
-        if self._rerender_required:
+        if self._rerender_required or self.manager.value != self._rendered_value:
             self._rerender()
             self._rerender_required = False
+        if self._cursor_rerender_required:
+            self._rerender_cursor()
+            self._cursor_rerender_required = False
         return self._surface
+
+    @property
+    def text_width(self):
+        """ Get the width in pixels of the rendered value, without the trailing cursor space """
+        return self.prefix_width(len(self.manager.value))
     
     @property
     def antialias(self):
@@ -205,6 +226,8 @@ class TextInputVisualizer:
     @font_object.setter
     def font_object(self, v):
         self._font_object = v
+        self._measured_value = ""
+        self._prefix_widths = {0: 0}
         self._require_rerender()
 
     @property
@@ -216,7 +239,7 @@ class TextInputVisualizer:
     def cursor_visible(self, v):
         self._cursor_visible = v
         self._last_blink_toggle = 0
-        self._require_rerender()
+        self._require_cursor_rerender()
     
     @property
     def cursor_width(self):
@@ -236,7 +259,7 @@ class TextInputVisualizer:
     @cursor_color.setter
     def cursor_color(self, v):
         self._cursor_color = v
-        self._require_rerender()
+        self._require_cursor_rerender()
 
     @property
     def cursor_blink_interval(self):
@@ -255,6 +278,7 @@ class TextInputVisualizer:
         """
 
         value_before = self.manager.value
+        self._last_cursor_pos = self.manager.cursor_pos
         self.manager.update(events)
         if self.manager.value != value_before:
             self._require_rerender()
@@ -265,13 +289,13 @@ class TextInputVisualizer:
             self._last_blink_toggle %= self._cursor_blink_interval
             self._cursor_visible = not self._cursor_visible
 
-            self._require_rerender()
+            self._require_cursor_rerender()
 
         # Make cursor visible when something is pressed
         if [event for event in events if event.type == pl.KEYDOWN]:
             self._last_blink_toggle = 0
             self._cursor_visible = True
-            self._require_rerender()
+            self._require_cursor_rerender()
 
 
     def _require_rerender(self):
@@ -279,25 +303,62 @@ class TextInputVisualizer:
         Trigger a re-render of the surface the next time the surface is accessed.
         """
         self._rerender_required = True
+        self._cursor_rerender_required = True
+
+    def _require_cursor_rerender(self):
+        """
+        Trigger a redraw of only the cursor the next time the surface is accessed.
+        """
+        self._cursor_rerender_required = True
 
     def _rerender(self):
-        """ Rerender self._surface."""
+        """ Rerender the text into self._text_surface and start self._surface as a copy of it."""
         # Final surface is slightly larger than font_render itself, to accomodate for cursor
-        rendered_surface = self.font_object.render(self.manager.value + " ",
+        self._rendered_value = self.manager.value
+        rendered_surface = self.font_object.render(self._rendered_value + " ",
                                                 self.antialias,
                                                 self.font_color)
         w, h = rendered_surface.get_size()
-        self._surface = pygame.Surface((w + self._cursor_width, h))
-        self._surface = self._surface.convert_alpha(rendered_surface)
-        self._surface.fill((0, 0, 0, 0))
-        self._surface.blit(rendered_surface, (0, 0))
-        
+        self._text_surface = pygame.Surface((w + self._cursor_width, h))
+        self._text_surface = self._text_surface.convert_alpha(rendered_surface)
+        self._text_surface.fill((0, 0, 0, 0))
+        self._text_surface.blit(rendered_surface, (0, 0))
+        self._surface = self._text_surface.copy()
+        self._cursor_rect = None
+        self._cursor_rerender_required = True
+
+    def _rerender_cursor(self):
+        """ Restore the text under the previous cursor and draw the cursor at its current position."""
+        if self._cursor_rect is not None:
+            self._surface.fill((0, 0, 0, 0), self._cursor_rect)
+            self._surface.blit(self._text_surface, self._cursor_rect, self._cursor_rect)
+            self._cursor_rect = None
+
         if self._cursor_visible:
-            str_left_of_cursor = self.manager.value[:self.manager.cursor_pos]
-            cursor_y = self.font_object.size(str_left_of_cursor)[0]
+            cursor_y = self.prefix_width(self.manager.cursor_pos)
             cursor_rect = pygame.Rect(cursor_y, 0, self._cursor_width, self.font_object.get_height())
+            self._cursor_rect = cursor_rect.clip(self._surface.get_rect())
             self._surface.fill(self._cursor_color, cursor_rect)
 
+    def prefix_width(self, index):
+        """
+        Width in pixels of the first `index` characters of the value, as `font_object.size` reports it.
+
+        Widths are cached per prefix. Edits made through the manager happen at the cursor, so after an
+        edit only the cached prefixes reaching past it are dropped and measured again when requested.
+        """
+        value = self.manager.value
+        if value != self._measured_value:
+            keep = min(self._last_cursor_pos, self.manager.cursor_pos, len(value))
+            if value[:keep] != self._measured_value[:keep]:
+                keep = 0
+            self._prefix_widths = {i: w for i, w in self._prefix_widths.items() if i <= keep}
+            self._measured_value = value
+        width = self._prefix_widths.get(index)
+        if width is None:
+            width = self._prefix_widths[index] = self.font_object.size(value[:index])[0]
+        return width
+
 
 ######################################
 #  The example from the repo README: #
@@ -0,0 +1,12 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from mario.world import World
+
+pygame.init()
+pygame.display.set_mode((World.CAMERA_WIDTH, World.HEIGHT))
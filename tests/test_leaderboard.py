@@ -0,0 +1,55 @@
+import json
+
+from mario.leaderboard import Leaderboard
+
+
+def make_leaderboard(tmp_path, legacy):
+    legacy_path = tmp_path / "records.json"
+    legacy_path.write_text(legacy, encoding="utf8")
+    return Leaderboard(str(tmp_path / "records.db"), str(legacy_path))
+
+
+def test_imports_valid_legacy_records(tmp_path):
+    records = [{"name": "Ann", "score": 300}, {"score": 900}, {"name": "Bob", "score": "x"},
+               {"name": "Cid", "score": 500}]
+    leaderboard = make_leaderboard(tmp_path, json.dumps(records))
+    leaderboard.start()
+    leaderboard.close()
+    assert leaderboard.records == [{"name": "Cid", "score": 500}, {"name": "Ann", "score": 300}]
+
+
+def test_survives_corrupt_legacy_file(tmp_path):
+    leaderboard = make_leaderboard(tmp_path, "{not json")
+    leaderboard.start()
+    leaderboard.add("Ann", 100)
+    leaderboard.close()
+    reopened = Leaderboard(leaderboard.path, leaderboard.legacy)
+    reopened.start()
+    reopened.close()
+    assert reopened.records == [{"name": "Ann", "score": 100}]
+
+
+def test_legacy_problems_are_reported(tmp_path):
+    leaderboard = make_leaderboard(tmp_path, json.dumps([{"name": "Ann", "score": 300}, {"score": 900}]))
+    leaderboard.start()
+    leaderboard.close()
+    assert leaderboard.error is None
+    assert "skipped 1 malformed" in leaderboard.warning
+
+
+def test_failed_board_is_not_an_empty_board(tmp_path):
+    leaderboard = Leaderboard(str(tmp_path / "missing" / "records.db"), str(tmp_path / "records.json"))
+    assert not leaderboard.is_best(0)
+    leaderboard.start()
+    leaderboard.close()
+    assert not leaderboard.loaded
+    assert leaderboard.error.startswith("refresh failed")
+    assert not leaderboard.is_best(10 ** 6)
+
+
+def test_empty_board_accepts_first_score(tmp_path):
+    leaderboard = make_leaderboard(tmp_path, "[]")
+    leaderboard.start()
+    leaderboard.close()
+    assert leaderboard.loaded and leaderboard.records == []
+    assert leaderboard.is_best(0)
@@ -0,0 +1,42 @@
+import pytest
+
+from mario import savestate
+from mario.world import World, Inputs
+
+
+def played_world(ticks=120):
+    world = World()
+    world.begin()
+    for tick in range(ticks):
+        world.step(Inputs(right=True, up=tick % 40 < 10))
+    return world
+
+
+def test_round_trip():
+    world = played_world()
+    state = world.save_state()
+    for _ in range(60):
+        world.step(Inputs(left=True))
+    world.load_state(state)
+    assert world.save_state() == state
+
+
+@pytest.mark.parametrize("cut", [1, savestate.HEADER.size + 3, -1, -savestate.SPRITE.size - 2])
+def test_truncated_state_leaves_world_unchanged(cut):
+    world = played_world()
+    state = world.save_state()
+    sprites = len(world.all_sprites)
+    with pytest.raises(ValueError):
+        world.load_state(state[:cut])
+    assert len(world.all_sprites) == sprites
+    assert world.save_state() == state
+
+
+def test_unknown_sprite_kind_is_rejected():
+    world = played_world()
+    state = world.save_state()
+    corrupt = bytearray(state)
+    corrupt[len(state) - savestate.SPRITE.size] = 200
+    with pytest.raises(ValueError):
+        world.load_state(bytes(corrupt))
+    assert world.save_state() == state
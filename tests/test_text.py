@@ -0,0 +1,69 @@
+import random
+
+import pygame
+import pytest
+
+from mario.text import TextLayout
+
+WORDS = ("Mario", "jump", "WAVE", "Коин", "очки", "Ёж", "To", "AV", "1-1", "score:", "", "a", "Player One",
+         "ГРИБ")
+
+
+def reference_surface(text, font, rect, font_color, bg_color, justification=0):
+    final_lines = []
+    for requested_line in text.splitlines():
+        if font.size(requested_line)[0] > rect.width:
+            words = requested_line.split(" ")
+            for word in words:
+                if font.size(word)[0] >= rect.width:
+                    raise Exception("The word " + word + " is too long to fit in the rect passed.")
+            accumulated_line = ""
+            for word in words:
+                test_line = accumulated_line + word + " "
+                if font.size(test_line)[0] < rect.width:
+                    accumulated_line = test_line
+                else:
+                    final_lines.append(accumulated_line)
+                    accumulated_line = word + " "
+            final_lines.append(accumulated_line)
+        else:
+            final_lines.append(requested_line)
+    surface = pygame.Surface(rect.size, pygame.SRCALPHA, 32).convert_alpha()
+    if bg_color is not None:
+        surface.fill(bg_color)
+    accumulated_height = 0
+    for line in final_lines:
+        if accumulated_height + font.size(line)[1] >= rect.height:
+            raise Exception("Once word-wrapped, the text string was too tall to fit in the rect.")
+        temp_surface = font.render(line, True, font_color)
+        if justification == 0:
+            surface.blit(temp_surface, (0, accumulated_height))
+        elif justification == 1:
+            surface.blit(temp_surface, ((rect.width - temp_surface.get_width()) / 2, accumulated_height))
+        else:
+            surface.blit(temp_surface, (rect.width - temp_surface.get_width(), accumulated_height))
+        accumulated_height += font.size(line)[1]
+    return surface
+
+
+def render_or_error(render, *args):
+    try:
+        return pygame.image.tobytes(render(*args), "RGBA")
+    except Exception as error:
+        return str(error)
+
+
+@pytest.mark.parametrize("path, size", [(None, 25), (None, 31), ("mario/mario.otf", 35),
+                                        ("mario/BarcadeBrawlRegular.ttf", 20)])
+def test_matches_reference(path, size):
+    font = pygame.font.Font(path, size)
+    rng = random.Random(size)
+    layout = TextLayout()
+    for _ in range(150):
+        lines = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 12))) for _ in range(rng.randint(1, 4))]
+        text = "\n".join(lines)
+        rect = pygame.Rect(0, 0, rng.randint(120, 700), rng.randint(60, 400))
+        justification = rng.randint(0, 2)
+        expected = render_or_error(reference_surface, text, font, rect, (255, 255, 255), (0, 0, 0), justification)
+        actual = render_or_error(layout.render, text, font, rect, (255, 255, 255), (0, 0, 0), justification)
+        assert actual == expected, (text, rect.size, justification)